@@ -1,28 +1,84 @@
+import importlib
 import logging
+from functools import lru_cache
+from logging.handlers import RotatingFileHandler
+from flask_compress import Compress
 from flask_login import LoginManager
-from flask import Flask, current_app
+from flask import Flask, jsonify, request, session as flask_session
+from werkzeug.exceptions import HTTPException
 
-from src.data.models import User
-from src.app.routes.quiz import quiz_bp
-from src.app.routes.llm import llm_bp
-from src.app.routes.note import note_bp
-from src.app.routes.ping import ping_bp
-from src.app.routes.user import user_bp
-from src.data.db import get_engine, init_db, get_session_local
+from src.app.auth import load_session_user
+from src.data.db import get_engine, init_db, get_scoped_session
+from src.utils.constants import ErrorMessages, HttpStatus
+from src.utils.json_provider import OrjsonProvider
 
 login_manager = LoginManager()
+compress = Compress()
 
-def create_app(config_class, log_file='app.log'):
+BLUEPRINTS = (
+    ("src.app.routes.ping", "ping_bp"),
+    ("src.app.routes.user", "user_bp"),
+    ("src.app.routes.llm", "llm_bp"),
+    ("src.app.routes.note", "note_bp"),
+    ("src.app.routes.quiz", "quiz_bp"),
+)
+
+LOG_FORMAT = '%(asctime)s %(levelname)s: %(message)s'
+
+def _configure_logging(log_file):
+    """
+    Attaches a rotating file handler to the root logger unless one is already configured.
+
+    Only ERROR records and above are logged, and each is written immediately.
+
+    Args:
+        log_file (str): Path of the log file to write to.
+    """
+    root_logger = logging.getLogger()
+    if root_logger.handlers:
+        return
+
+    file_handler = RotatingFileHandler(log_file, maxBytes=10_000_000, backupCount=3, delay=True)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    root_logger.addHandler(file_handler)
+    root_logger.setLevel(logging.ERROR)
+
+@lru_cache(maxsize=8)
+def _engine_for(database_url, raise_on_lazy_load=False, **pool_options):
+    """
+    Returns the engine and scoped session registry for a database URL, creating them once.
+
+    The schema is initialized only on first use of a URL, so repeated `create_app` calls
+    (e.g. across a test suite) skip engine construction and the `CREATE TABLE` round-trips.
+
+    Args:
+        database_url (str): The database connection string.
+        raise_on_lazy_load (bool): Whether lazy loads that emit SQL should raise.
+        **pool_options: Connection pool options passed through to `get_engine`.
+
+    Returns:
+        tuple[Engine, scoped_session]: The cached engine and its session registry.
+    """
+    engine = get_engine(database_url, **pool_options)
+    init_db(engine)
+    return engine, get_scoped_session(engine, raise_on_lazy_load=raise_on_lazy_load)
+
+def create_app(config_class, log_file='app.log', blueprints=None):
     """
     Application factory function for creating and configuring a Flask app instance.
 
     This function:
-    - Loads environment variables using `dotenv`
-    - Initializes the Flask app and loads configuration from a Config class
-    - Sets up the SQLAlchemy engine and session handling based on the config
-    - Initializes Flask-Login
-    - Registers all application blueprints (ping, user, llm, note) — add them where indicated
-    - Configures basic logging to a file
+    - Initializes the Flask app with an orjson-backed JSON provider and loads configuration from a Config class
+    - Sets up (or reuses, per database URL) the SQLAlchemy engine and a scoped session
+      that is finalized and removed once per request (commit if ORM changes are pending,
+      rollback on an unhandled exception) and again on app-context teardown
+    - Turns errors a view does not handle itself into a JSON 500 (after rolling back the session)
+    - Initializes Flask-Login and Flask-Compress (Brotli/gzip for JSON, NDJSON and MessagePack responses)
+    - Imports and registers the application blueprints lazily (all of `BLUEPRINTS` by default)
+      and compiles the URL map up front, so the first request does not pay for it
+    - Answers the ping health check in WSGI middleware, ahead of Flask's request handling
+    - Configures rotating file logging once per process
 
     If required configuration values (`SECRET_KEY`, `DATABASE_URL`) are missing,
     a `ValueError` is raised. Any other exception during initialization is logged
@@ -31,14 +87,19 @@ def create_app(config_class, log_file='app.log'):
     Args:
         config_class (class): A Config class (e.g., DevelopmentConfig or ProductionConfig)
         log_file (str): Name of the file where logs should be written. Defaults to `'app.log'`.
+        blueprints (iterable[str], optional): Blueprint names (e.g. `'ping_bp'`) to register.
+            Defaults to `None`, which registers every blueprint in `BLUEPRINTS`.
 
     Returns:
         Flask or None: A configured Flask application instance, or `None` if initialization fails.
     """
 
+    _configure_logging(log_file)
+
     try:
 
         app = Flask(__name__)
+        app.json = OrjsonProvider(app)
         app.config.from_object(config_class)
 
         if not app.config.get("SECRET_KEY"):
@@ -46,33 +107,69 @@ def create_app(config_class, log_file='app.log'):
         if not app.config.get("DATABASE_URL"):
             raise ValueError("DATABASE_URL is not set!")
 
-        engine = get_engine(app.config["DATABASE_URL"])
-        init_db(engine)
+        engine, session_local = _engine_for(
+            app.config["DATABASE_URL"],
+            raise_on_lazy_load=app.config["DB_RAISE_ON_LAZY_LOAD"],
+            pool_size=app.config["DB_POOL_SIZE"],
+            max_overflow=app.config["DB_MAX_OVERFLOW"],
+            pool_timeout=app.config["DB_POOL_TIMEOUT"],
+            pool_recycle=app.config["DB_POOL_RECYCLE"],
+            pool_pre_ping=app.config["DB_POOL_PRE_PING"],
+            pool_use_lifo=app.config["DB_POOL_USE_LIFO"],
+        )
 
         app.config['ENGINE'] = engine
-        app.config['SESSION_LOCAL'] = get_session_local(engine)
+        app.config['SESSION_LOCAL'] = session_local
+
+        @app.teardown_request
+        def finish_session(exception=None):
+            session_local = app.config['SESSION_LOCAL']
+            if not session_local.registry.has():
+                return
+            session = session_local()
+            try:
+                if exception is not None:
+                    session.rollback()
+                elif session.new or session.dirty or session.deleted:
+                    session.commit()
+            finally:
+                session_local.remove()
+
+        @app.teardown_appcontext
+        def remove_session(_exception=None):
+            app.config['SESSION_LOCAL'].remove()
+
+        @app.errorhandler(Exception)
+        def handle_unexpected_error(error):
+            # Views only catch the errors they map to a specific status; everything else
+            # ends up here. Handling the error means `finish_session` sees no exception,
+            # so roll back explicitly instead of committing a half-done unit of work. The
+            # details are logged only; clients get a generic message.
+            if isinstance(error, HTTPException):
+                return error
+            app.config['SESSION_LOCAL'].rollback()
+            app.logger.exception("Unhandled error on %s", request.path)
+            return jsonify({"error": ErrorMessages.INTERNAL_ERROR}), HttpStatus.INTERNAL_SERVER_ERROR
 
         login_manager.init_app(app)
+        compress.init_app(app)
 
         @login_manager.user_loader
         def load_user(user_id):
-            session = current_app.config['SESSION_LOCAL']()
-            try:
-                return session.query(User).get(int(user_id))
-            finally:
-                session.close()
-
-        app.register_blueprint(ping_bp)
-        app.register_blueprint(user_bp)
-        app.register_blueprint(llm_bp)
-        app.register_blueprint(note_bp)
-        app.register_blueprint(quiz_bp)
-
-        logging.basicConfig(
-            filename=log_file,
-            level=logging.ERROR,
-            format='%(asctime)s %(levelname)s: %(message)s'
-        )
+            user = load_session_user(app.config['SESSION_LOCAL'], user_id)
+            if user is None:
+                flask_session.pop("_user_id", None)
+            return user
+
+        for module_name, blueprint_name in BLUEPRINTS:
+            if blueprints is not None and blueprint_name not in blueprints:
+                continue
+            module = importlib.import_module(module_name)
+            app.register_blueprint(getattr(module, blueprint_name))
+            if blueprint_name == "ping_bp":
+                app.wsgi_app = module.PingMiddleware(app.wsgi_app)
+
+        app.url_map.update()
 
         return app
 
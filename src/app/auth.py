@@ -0,0 +1,97 @@
+import hmac
+
+from hashlib import sha256
+
+from flask import current_app
+from sqlalchemy import select
+
+from src.data.models.users import User
+
+
+def session_auth_hash(password_hash: str) -> str:
+    """
+    Returns the value that ties a session cookie to the account's current password.
+
+    It is an HMAC (keyed with SECRET_KEY) of the stored password hash, so it changes whenever
+    the password does and reveals nothing about the hash itself.
+
+    Args:
+        password_hash (str): The user's stored password hash.
+
+    Returns:
+        str: The hex digest stored in the session next to the user ID.
+    """
+    key = current_app.secret_key
+    if isinstance(key, str):
+        key = key.encode()
+    return hmac.new(key, password_hash.encode(), sha256).hexdigest()
+
+
+class SessionUser:
+    """
+    Authenticated identity restored from Flask-Login's signed session cookie.
+
+    The session stores the user ID together with `session_auth_hash` of the password hash
+    (see `get_id`). On every request `load_session_user` checks both with a single
+    primary-key lookup of the password hash instead of loading the User row, so a session
+    stops working as soon as its account is deleted or its password is changed. Routes only
+    need `current_user.id`; services that require the full account (e.g. admin checks) load
+    it themselves.
+
+    Attributes:
+        id (int): ID of the logged-in user.
+        auth_hash (str): `session_auth_hash` of the password hash at login time.
+    """
+
+    def __init__(self, user_id: int, auth_hash: str):
+        self.id = user_id
+        self.auth_hash = auth_hash
+
+    @classmethod
+    def for_user(cls, user: User) -> "SessionUser":
+        """Creates the session identity for a freshly authenticated user, to pass to `login_user`."""
+        return cls(user.id, session_auth_hash(user.password_hash))
+
+    @property
+    def is_active(self):
+        return True
+
+    @property
+    def is_authenticated(self):
+        return True
+
+    @property
+    def is_anonymous(self):
+        return False
+
+    def get_id(self):
+        return f"{self.id}:{self.auth_hash}"
+
+    def __repr__(self):
+        return f"<SessionUser(id={self.id})>"
+
+
+def load_session_user(db_session, session_id: str) -> SessionUser | None:
+    """
+    Restores the logged-in user from the ID stored in the session, if it is still valid.
+
+    Args:
+        db_session (Session): SQLAlchemy session for the password hash lookup.
+        session_id (str): The value produced by `SessionUser.get_id`.
+
+    Returns:
+        SessionUser | None: The user, or None if the ID is malformed, the account no longer
+        exists or its password has changed since the login.
+    """
+    user_id, _, auth_hash = session_id.partition(":")
+    if not user_id.isdigit() or not auth_hash:
+        return None
+
+    # This lookup is what revokes sessions of deleted accounts and changed passwords; the signed
+    # cookie alone cannot know about either. Keep it, even though it costs a query per request.
+    password_hash = db_session.execute(
+        select(User.password_hash).where(User.id == int(user_id))
+    ).scalar_one_or_none()
+    if password_hash is None or not hmac.compare_digest(auth_hash, session_auth_hash(password_hash)):
+        return None
+    return SessionUser(int(user_id), auth_hash)
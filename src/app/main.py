@@ -2,11 +2,11 @@ import os
 
 from dotenv import load_dotenv
 
+load_dotenv()
+
 from src.app import create_app
 from src.config.config import DevelopmentConfig, ProductionConfig
 
-load_dotenv()
-
 env = os.getenv("APP_ENV", "development")
 
 if env == "production":
@@ -1,11 +1,12 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, jsonify, current_app
 from flask_login import login_required, current_user
 
+from src.app.schemas import CheckAnswerRequest, validate_body
 from src.app.services.flashcard_service import FlashcardService
 from src.app.services.llm_service import LLMService
 from src.utils.constants import HttpStatus, ErrorMessages
 from src.utils.llm_api import generate_flashcards_from_summary, generate_summary_from_note, \
-    check_user_answer_with_llm
+    generate_summary_and_flashcards, check_user_answer_cached
 
 llm_bp = Blueprint('llm', __name__, url_prefix='/llm')
 
@@ -30,7 +31,7 @@ def generate_flashcard(note_id):
         or if there is no AI summary available.
         500 Internal Server Error if flashcard generation or database operations fail.
     """
-    session = current_app.config['SESSION_LOCAL']()
+    session = current_app.config['SESSION_LOCAL']
     service = LLMService(session)
     flashcard_service = FlashcardService(session)
 
@@ -44,11 +45,6 @@ def generate_flashcard(note_id):
         return jsonify({"message": "Flashcards generated successfully"}), HttpStatus.CREATED
     except ValueError as error:
         return jsonify({"error": str(error)}), HttpStatus.NOT_FOUND
-    except Exception as error:
-        session.rollback()
-        return jsonify({"error": str(error)}), HttpStatus.INTERNAL_SERVER_ERROR
-    finally:
-        session.close()
 
 @llm_bp.route('/generate-summary/<int:note_id>', methods=['POST'])
 @login_required
@@ -72,7 +68,7 @@ def generate_summary(note_id):
         500 Internal Server Error if summary generation or database operations fail.
     """
 
-    session = current_app.config['SESSION_LOCAL']()
+    session = current_app.config['SESSION_LOCAL']
     service = LLMService(session)
 
     try:
@@ -82,15 +78,50 @@ def generate_summary(note_id):
         code = HttpStatus.NOT_FOUND if str(
             ve) == ErrorMessages.NOTE_NOT_FOUND else HttpStatus.BAD_REQUEST
         return jsonify({"error": str(ve)}), code
-    except Exception as error:
-        session.rollback()
-        return jsonify({"error": str(error)}), HttpStatus.INTERNAL_SERVER_ERROR
-    finally:
-        session.close()
+
+@llm_bp.route('/generate-summary-and-flashcards/<int:note_id>', methods=['POST'])
+@login_required
+def generate_summary_and_flashcard(note_id):
+    """
+    Generates the AI summary and the flashcards of a specified note in one step.
+
+    Args:
+        note_id (int): The ID of the note to process.
+
+    Equivalent to calling `/generate-summary` and then `/generate-flashcard`, but both
+    are produced by a single LLM request. Existing flashcards of the note are replaced.
+
+    Returns:
+        JSON containing the generated summary and the number of created flashcards
+        with HTTP status 201 (Created).
+
+    Raises:
+        404 Not Found if the note does not exist or is not owned by the user.
+        400 Bad Request if the original content is missing.
+        500 Internal Server Error if generation or database operations fail.
+    """
+
+    session = current_app.config['SESSION_LOCAL']
+    service = LLMService(session)
+    flashcard_service = FlashcardService(session)
+
+    try:
+        summary, _, flashcard_count = service.generate_summary_and_flashcards(
+            note_id,
+            current_user.id,
+            generate_summary_and_flashcards,
+            flashcard_service
+        )
+        return jsonify({"ai_summary": summary, "flashcard_count": flashcard_count}), HttpStatus.CREATED
+    except ValueError as ve:
+        code = HttpStatus.NOT_FOUND if str(
+            ve) == ErrorMessages.NOTE_NOT_FOUND else HttpStatus.BAD_REQUEST
+        return jsonify({"error": str(ve)}), code
 
 @llm_bp.route('/check-answer', methods=['POST'])
 @login_required
-def check_answer():
+@validate_body(CheckAnswerRequest)
+def check_answer(payload):
     """
     Evaluates a user's answer to a flashcard question using the LLM.
 
@@ -103,31 +134,27 @@ def check_answer():
         JSON containing feedback on the user's answer with HTTP status 200 (OK).
 
     Raises:
-        400 Bad Request if any required fields are missing.
+        400 Bad Request if the body is not valid JSON, a field has the wrong type,
+        or any required fields are missing.
         500 Internal Server Error if answer evaluation or LLM interaction fails.
     """
 
-    data = request.get_json()
-    question = data.get('question')
-    correct_answer = data.get('correct_answer')
-    user_answer = data.get('user_answer')
-    language = data.get('language')
+    question = payload.question
+    correct_answer = payload.correct_answer
+    user_answer = payload.user_answer
+    language = payload.language
 
-    session = current_app.config['SESSION_LOCAL']()
+    session = current_app.config['SESSION_LOCAL']
     service = LLMService(session)
 
-    if not all([question, correct_answer, user_answer]):
+    if not question or not correct_answer or not user_answer:
         return jsonify({"error": ErrorMessages.MISSING_ANSWER_FIELD}), HttpStatus.BAD_REQUEST
     if not language:
         return jsonify({"error": ErrorMessages.MISSING_LANGUAGE}), HttpStatus.BAD_REQUEST
 
     try:
         result = service.check_answer(question, correct_answer, user_answer, language,
-                                      check_user_answer_with_llm)
+                                      check_user_answer_cached)
         return jsonify(result), HttpStatus.OK
     except ValueError as ve:
         return jsonify({"error": str(ve)}), HttpStatus.BAD_REQUEST
-    except Exception as error:
-        return jsonify({"error": str(error)}), HttpStatus.INTERNAL_SERVER_ERROR
-    finally:
-        session.close()
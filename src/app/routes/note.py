@@ -1,14 +1,18 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, jsonify, current_app
 from flask_login import login_required, current_user
 
+from src.app.schemas import StoreNoteRequest, UpdateNoteRequest, validate_body
 from src.app.services.note_service import NoteService
 from src.utils.constants import HttpStatus, ErrorMessages
+from src.utils.responses import STREAM_MIMETYPES, negotiate_mimetype, respond_stream, etag_matches, \
+    not_modified, tag_response
 
 note_bp = Blueprint('note', __name__, url_prefix='/note')
 
 @note_bp.route('/store-note', methods=['POST'])
 @login_required
-def store_note():
+@validate_body(StoreNoteRequest)
+def store_note(payload):
     """
     Creates a new note associated with the currently authenticated user.
 
@@ -21,22 +25,17 @@ def store_note():
         along with HTTP status code 201 (Created).
 
     Raises:
-        400 Bad Request if required fields are missing.
+        400 Bad Request if the body is malformed or required fields are missing.
         500 Internal Server Error if any database operation fails.
     """
-    data = request.get_json()
-    session = current_app.config['SESSION_LOCAL']()
+    session = current_app.config['SESSION_LOCAL']
     service = NoteService(session)
 
     try:
-        note = service.create_note(current_user.id, data.get('title'), data.get('content'))
+        note = service.create_note(current_user.id, payload.title, payload.content)
         return jsonify({'message': 'Note created', 'note_id': note.note_id}), HttpStatus.CREATED
     except ValueError as err:
         return jsonify({"error": str(err)}), HttpStatus.BAD_REQUEST
-    except Exception as error:
-        return jsonify({"error": str(error)}), HttpStatus.INTERNAL_SERVER_ERROR
-    finally:
-        session.close()
 
 @note_bp.route('/get-note/<int:note_id>', methods=['GET'])
 @login_required
@@ -52,28 +51,27 @@ def get_note(note_id):
         note_id (int): The unique identifier of the note to be retrieved.
 
     Returns:
-        A JSON object containing the 'ai_summary' field of the note on success with HTTP 200 status.
+        A JSON object containing the 'ai_summary' field of the note on success with HTTP 200 status,
+        tagged with a weak ETag. If the request's `If-None-Match` matches it, an empty
+        304 Not Modified is returned instead.
 
     Raises:
         404 Not Found if no matching note is found for the current user.
         500 Internal Server Error if any unexpected error occurs during processing.
     """
 
-    session = current_app.config['SESSION_LOCAL']()
+    session = current_app.config['SESSION_LOCAL']
     service = NoteService(session)
 
-    try:
-        note = service.get_note_by_id(note_id, current_user.id)
-        if not note:
-            return jsonify({"error": ErrorMessages.NOTE_NOT_FOUND}), HttpStatus.NOT_FOUND
-
-        return jsonify({"ai_summary": note.ai_summary}), HttpStatus.OK
+    note = service.get_note_by_id(note_id, current_user.id)
+    if not note:
+        return jsonify({"error": ErrorMessages.NOTE_NOT_FOUND}), HttpStatus.NOT_FOUND
 
-    except Exception as error:
-        return jsonify({"error": str(error)}), HttpStatus.INTERNAL_SERVER_ERROR
+    etag = f"{note.note_id}-{note.updated_at.isoformat()}"
+    if etag_matches(etag):
+        return not_modified(etag)
 
-    finally:
-        session.close()
+    return tag_response(jsonify({"ai_summary": note.ai_summary}), etag), HttpStatus.OK
 
 @note_bp.route('/get-notes', methods=['GET'])
 @login_required
@@ -86,31 +84,36 @@ def get_notes():
 
     Returns:
         A JSON array of objects, where each object contains 'note_id' and 'title' keys,
-        with an HTTP 200 status indicating successful retrieval.
+        with an HTTP 200 status indicating successful retrieval. Encoded as MessagePack
+        instead when the client prefers `application/msgpack`, or streamed as JSON Lines
+        (one object per line) for `application/x-ndjson`. The response carries a weak ETag
+        derived from the note count, latest modification time and negotiated format; a
+        matching `If-None-Match` yields an empty 304 Not Modified.
 
     Raises:
         500 Internal Server Error if an unexpected error occurs during database interaction.
     """
 
-    session = current_app.config['SESSION_LOCAL']()
+    session = current_app.config['SESSION_LOCAL']
     service = NoteService(session)
 
-    try:
-        notes = service.get_all_notes_for_user(current_user.id)
-        result = [
-            {"note_id": note.note_id, "title": note.title} for note in notes
-        ]
-        return jsonify(result), HttpStatus.OK
-
-    except Exception as error:
-        return jsonify({"error": str(error)}), HttpStatus.INTERNAL_SERVER_ERROR
+    count, last_updated = service.get_notes_version(current_user.id)
+    mimetype = negotiate_mimetype(STREAM_MIMETYPES)
+    etag = f"{current_user.id}-{count}-{last_updated.isoformat() if last_updated else ''}-{mimetype}"
+    if etag_matches(etag):
+        return not_modified(etag, vary=("Accept",))
 
-    finally:
-        session.close()
+    notes = service.stream_notes_for_user(current_user.id)
+    result = (
+        {"note_id": note.note_id, "title": note.title} for note in notes
+    )
+    response, status = respond_stream(result, HttpStatus.OK)
+    return tag_response(response, etag), status
 
 @note_bp.route('/update-note/<int:note_id>', methods=['PUT'])
 @login_required
-def update_note(note_id):
+@validate_body(UpdateNoteRequest)
+def update_note(note_id, payload):
     """
     Updates the title and/or content of a note owned by the authenticated user.
 
@@ -125,30 +128,19 @@ def update_note(note_id):
         A JSON response confirming successful update with HTTP 200 status.
 
     Raises:
+        400 Bad Request if the body is malformed.
         404 Not Found if the note does not exist or is not owned by the current user.
         500 Internal Server Error if the update operation fails.
     """
 
-    data = request.get_json()
-    title = data.get('title')
-    content = data.get('content')
-
-    session = current_app.config['SESSION_LOCAL']()
+    session = current_app.config['SESSION_LOCAL']
     service = NoteService(session)
 
-    try:
-        success = service.update_note(note_id, current_user.id, title, content)
-        if not success:
-            return jsonify({"error": ErrorMessages.NOTE_NOT_FOUND}), HttpStatus.NOT_FOUND
+    success = service.update_note(note_id, current_user.id, payload.title, payload.content)
+    if not success:
+        return jsonify({"error": ErrorMessages.NOTE_NOT_FOUND}), HttpStatus.NOT_FOUND
 
-        return jsonify({"message": "Note updated successfully"}), HttpStatus.OK
-
-    except Exception as error:
-        session.rollback()
-        return jsonify({"error": str(error)}), HttpStatus.INTERNAL_SERVER_ERROR
-
-    finally:
-        session.close()
+    return jsonify({"message": "Note updated successfully"}), HttpStatus.OK
 
 @note_bp.route('/delete-note/<int:note_id>', methods=['DELETE'])
 @login_required
@@ -170,21 +162,13 @@ def delete_note(note_id):
         500 Internal Server Error if deletion fails due to database errors.
     """
 
-    session = current_app.config['SESSION_LOCAL']()
+    session = current_app.config['SESSION_LOCAL']
     service = NoteService(session)
 
-    try:
-        success = service.delete_note(note_id, current_user.id)
-        if not success:
-            return jsonify({"error": ErrorMessages.NOTE_NOT_FOUND}), HttpStatus.NOT_FOUND
-
-        return jsonify({"message": "Note deleted successfully"}), HttpStatus.OK
-
-    except Exception as error:
-        session.rollback()
-        return jsonify({"error": str(error)}), HttpStatus.INTERNAL_SERVER_ERROR
+    success = service.delete_note(note_id, current_user.id)
+    if not success:
+        return jsonify({"error": ErrorMessages.NOTE_NOT_FOUND}), HttpStatus.NOT_FOUND
 
-    finally:
-        session.close()
+    return jsonify({"message": "Note deleted successfully"}), HttpStatus.OK
 
 
@@ -2,6 +2,35 @@ from flask import Blueprint
 
 ping_bp = Blueprint("ping", __name__, url_prefix="/api/v1")
 
+PING_PATH = "/api/v1/ping"
+PING_BODY = b"pong"
+
 @ping_bp.route("/ping")
 def ping():
-    return "pong"
\ No newline at end of file
+    return "pong"
+
+class PingMiddleware:
+    """
+    WSGI middleware that answers `GET`/`HEAD /api/v1/ping` before Flask sees the request.
+
+    Health checks from load balancers skip routing, request-context setup, the login
+    manager and the database session entirely. Any other request, including other
+    methods on the ping path, is passed on to the wrapped application.
+
+    Args:
+        wsgi_app (callable): The WSGI application to wrap, usually `app.wsgi_app`.
+    """
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        method = environ.get("REQUEST_METHOD")
+        if environ.get("PATH_INFO") != PING_PATH or method not in ("GET", "HEAD"):
+            return self.wsgi_app(environ, start_response)
+
+        start_response("200 OK", [
+            ("Content-Type", "text/html; charset=utf-8"),
+            ("Content-Length", str(len(PING_BODY))),
+        ])
+        return [b""] if method == "HEAD" else [PING_BODY]
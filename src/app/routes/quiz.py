@@ -1,7 +1,10 @@
+from itertools import chain
+
 from flask import Blueprint, jsonify, current_app
 from flask_login import login_required, current_user
 from src.app.services.quiz_service import QuizService
 from src.utils.constants import HttpStatus
+from src.utils.responses import respond_stream
 
 quiz_bp = Blueprint("quiz", __name__, url_prefix="/quiz")
 
@@ -15,25 +18,23 @@ def start_quiz(note_id):
         note_id (int): ID of the note to start quiz for.
 
     Returns:
-        JSON containing the flashcards for the quiz and HTTP status 200.
+        JSON containing the flashcards for the quiz and HTTP status 200, or MessagePack
+        if the client prefers `application/msgpack`. For `application/x-ndjson` the
+        flashcards are streamed as JSON Lines (one object per line) without the wrapper.
 
     Raises:
         404 Not Found if no flashcards found or note doesn't belong to user.
         500 Internal Server Error on unexpected failures.
     """
-    session = current_app.config['SESSION_LOCAL']()
+    session = current_app.config['SESSION_LOCAL']
     service = QuizService(session)
 
-    try:
-        flashcards = service.get_flashcards_for_quiz(current_user.id, note_id)
-        if not flashcards:
-            return jsonify({"error": "No flashcards found for this note"}), HttpStatus.NOT_FOUND
-        return jsonify({"flashcards": flashcards}), HttpStatus.OK
-    except Exception as error:
-        session.rollback()
-        return jsonify({"error": str(error)}), HttpStatus.INTERNAL_SERVER_ERROR
-    finally:
-        session.close()
+    rows = service.stream_flashcards_for_quiz(current_user.id, note_id).mappings()
+    first = rows.fetchone()
+    if first is None:
+        return jsonify({"error": "No flashcards found for this note"}), HttpStatus.NOT_FOUND
+    flashcards = (dict(row) for row in chain([first], rows))
+    return respond_stream(flashcards, HttpStatus.OK, envelope="flashcards")
 
 @quiz_bp.route("/progress/<int:note_id>", methods=["GET"])
 @login_required
@@ -51,16 +52,10 @@ def get_progress(note_id):
         404 Not Found if progress data is unavailable.
         500 Internal Server Error on unexpected failures.
     """
-    session = current_app.config['SESSION_LOCAL']()
+    session = current_app.config['SESSION_LOCAL']
     service = QuizService(session)
 
-    try:
-        progress = service.get_progress(current_user.id, note_id)
-        if progress is None:
-            return jsonify({"error": "Progress data not found"}), HttpStatus.NOT_FOUND
-        return jsonify(progress), HttpStatus.OK
-    except Exception as error:
-        session.rollback()
-        return jsonify({"error": str(error)}), HttpStatus.INTERNAL_SERVER_ERROR
-    finally:
-        session.close()
+    progress = service.get_progress(current_user.id, note_id)
+    if progress is None:
+        return jsonify({"error": "Progress data not found"}), HttpStatus.NOT_FOUND
+    return jsonify(progress), HttpStatus.OK
@@ -1,14 +1,19 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, jsonify, current_app
 from flask_login import login_required, current_user, logout_user, login_user
 
+from src.app.auth import SessionUser
+from src.app.schemas import CreateUserRequest, UpdateUserRequest, ChangePasswordRequest, \
+    PasswordResetEmailRequest, PasswordResetRequest, LoginRequest, validate_body
 from src.app.services.user_service import UserService
 from src.utils.constants import HttpStatus, ErrorMessages
+from src.utils.responses import respond, respond_stream
 
 
 user_bp = Blueprint('user', __name__, url_prefix='/user')
 
 @user_bp.route("/create-user", methods=["POST"])
-def create_user():
+@validate_body(CreateUserRequest)
+def create_user(payload):
     """
     Create a new user account.
 
@@ -27,24 +32,18 @@ def create_user():
         400 Bad Request: If required fields are missing or already exist.
         500 Internal Server Error: If an unexpected error occurs.
     """
-    data = request.get_json()
-    session = current_app.config['SESSION_LOCAL']()
+    session = current_app.config['SESSION_LOCAL']
 
     try:
         user_service = UserService(session)
         new_user = user_service.create_user(
-            data.get("username"),
-            data.get("email"),
-            data.get("password")
+            payload.username,
+            payload.email,
+            payload.password
         )
         return jsonify({"message": "User created successfully", "user_id": new_user.id}), HttpStatus.CREATED
     except ValueError as error:
         return jsonify({"error": str(error)}), HttpStatus.BAD_REQUEST
-    except Exception as error:
-        session.rollback()
-        return jsonify({"error": str(error)}), HttpStatus.INTERNAL_SERVER_ERROR
-    finally:
-        session.close()
 
 
 @user_bp.route("/get-user/<int:user_id>", methods=["GET"])
@@ -65,7 +64,7 @@ def get_user(user_id):
         404 Not Found if user doesn't exist.
         500 Internal Server Error on unexpected errors.
     """
-    session = current_app.config['SESSION_LOCAL']()
+    session = current_app.config['SESSION_LOCAL']
 
     try:
         user_service = UserService(session)
@@ -84,15 +83,10 @@ def get_user(user_id):
     except PermissionError:
         return jsonify({"error": ErrorMessages.UNAUTHORIZED_ACCESS}), HttpStatus.FORBIDDEN
 
-    except Exception as error:
-        return jsonify({"error": str(error)}), HttpStatus.INTERNAL_SERVER_ERROR
-
-    finally:
-        session.close()
-
 @user_bp.route("/update-user/<int:user_id>", methods=["PUT"])
 @login_required
-def update_user(user_id):
+@validate_body(UpdateUserRequest)
+def update_user(user_id, payload):
     """
     Updates username and/or email of the authenticated user.
 
@@ -109,16 +103,15 @@ def update_user(user_id):
         404 Not Found if user doesn't exist.
         500 Internal Server Error on unexpected errors.
     """
-    session = current_app.config['SESSION_LOCAL']()
-    data = request.get_json()
+    session = current_app.config['SESSION_LOCAL']
 
     try:
         user_service = UserService(session)
         user_service.update_user(
             user_id=user_id,
             requesting_user_id=current_user.id,
-            username=data.get("username"),
-            email=data.get("email")
+            username=payload.username,
+            email=payload.email
         )
         return jsonify({"message": "User updated successfully"}), HttpStatus.OK
 
@@ -128,13 +121,6 @@ def update_user(user_id):
     except PermissionError as error:
         return jsonify({"error": str(error)}), HttpStatus.FORBIDDEN
 
-    except Exception as error:
-        session.rollback()
-        return jsonify({"error": str(error)}), HttpStatus.INTERNAL_SERVER_ERROR
-
-    finally:
-        session.close()
-
 @user_bp.route("/delete-user/<int:user_id>", methods=["DELETE"])
 @login_required
 def delete_user(user_id):
@@ -152,7 +138,7 @@ def delete_user(user_id):
         404 Not Found if user doesn't exist.
         500 Internal Server Error on unexpected errors.
     """
-    session = current_app.config['SESSION_LOCAL']()
+    session = current_app.config['SESSION_LOCAL']
 
     try:
         user_service = UserService(session)
@@ -167,13 +153,6 @@ def delete_user(user_id):
     except PermissionError as error:
         return jsonify({"error": str(error)}), HttpStatus.FORBIDDEN
 
-    except Exception as error:
-        session.rollback()
-        return jsonify({"error": str(error)}), HttpStatus.INTERNAL_SERVER_ERROR
-
-    finally:
-        session.close()
-
 @user_bp.route("/logout", methods=["POST"])
 @login_required
 def logout():
@@ -196,25 +175,20 @@ def list_users():
     a list of users including their ID, username, and email.
 
     Returns:
-        200 OK: List of user objects.
+        200 OK: List of user objects (MessagePack if the client prefers `application/msgpack`,
+            streamed JSON Lines for `application/x-ndjson`).
         403 Forbidden: If the authenticated user is not an admin.
         500 Internal Server Error: On unexpected failure.
     """
-    session = current_app.config['SESSION_LOCAL']()
+    session = current_app.config['SESSION_LOCAL']
     try:
         user_service = UserService(session)
-        user_list = user_service.get_all_users_if_admin(current_user)
-        return jsonify(user_list), HttpStatus.OK
+        users = user_service.stream_all_users_if_admin(current_user.id)
+        return respond_stream(users, HttpStatus.OK)
 
     except PermissionError as error:
         return jsonify({"error": str(error)}), HttpStatus.FORBIDDEN
 
-    except Exception as error:
-        return jsonify({"error": str(error)}), HttpStatus.INTERNAL_SERVER_ERROR
-
-    finally:
-        session.close()
-
 @user_bp.route("/fetch-flashcards/<int:user_id>", methods=["GET"])
 @login_required
 def fetch_flashcards(user_id):
@@ -225,29 +199,27 @@ def fetch_flashcards(user_id):
         user_id (int): ID of the user whose flashcards to retrieve.
 
     Returns:
-        JSON list of flashcards (id, question, answer) on HTTP 200.
+        JSON list of flashcards (id, question, answer) on HTTP 200, or MessagePack
+        if the client prefers `application/msgpack`.
         403 Forbidden if user requests flashcards of another user.
         404 Not Found if user doesn't exist.
         500 Internal Server Error on unexpected errors.
     """
-    session = current_app.config['SESSION_LOCAL']()
+    session = current_app.config['SESSION_LOCAL']
     service = UserService(session)
 
     try:
         flashcard_list = service.fetch_flashcards_for_user(user_id, current_user.id)
-        return jsonify(flashcard_list), HttpStatus.OK
+        return respond(flashcard_list, HttpStatus.OK)
     except ValueError as ve:
         return jsonify({"error": str(ve)}), HttpStatus.NOT_FOUND
     except PermissionError as pe:
         return jsonify({"error": str(pe)}), HttpStatus.FORBIDDEN
-    except Exception as error:
-        return jsonify({"error": str(error)}), HttpStatus.INTERNAL_SERVER_ERROR
-    finally:
-        session.close()
 
 @user_bp.route("/change-password/<int:user_id>", methods=["POST"])
 @login_required
-def change_password(user_id):
+@validate_body(ChangePasswordRequest)
+def change_password(user_id, payload):
     """
     Changes the password for the authenticated user after verifying current password.
 
@@ -262,17 +234,17 @@ def change_password(user_id):
         404 Not Found if user doesn't exist.
         500 Internal Server Error on unexpected errors.
     """
-    session = current_app.config['SESSION_LOCAL']()
-    data = request.get_json()
+    session = current_app.config['SESSION_LOCAL']
 
     try:
         user_service = UserService(session)
         user_service.change_password(
             user_id,
             current_user.id,
-            data.get("current_password"),
-            data.get("new_password"),
+            payload.current_password,
+            payload.new_password,
         )
+        login_user(SessionUser.for_user(user_service.get_user_if_authorized(user_id, current_user.id)))
         return jsonify({"message": "Password changed successfully"}), HttpStatus.OK
 
     except ValueError as error:
@@ -281,15 +253,9 @@ def change_password(user_id):
     except PermissionError as error:
         return jsonify({"error": str(error)}), HttpStatus.FORBIDDEN
 
-    except Exception as error:
-        session.rollback()
-        return jsonify({"error": str(error)}), HttpStatus.INTERNAL_SERVER_ERROR
-
-    finally:
-        session.close()
-
 @user_bp.route("/request-password-reset", methods=["POST"])
-def request_password_reset():
+@validate_body(PasswordResetEmailRequest)
+def request_password_reset(payload):
     """
     Initiates a password reset request by sending an email with a reset token link.
 
@@ -297,30 +263,24 @@ def request_password_reset():
         JSON body containing "email".
 
     Returns:
-        JSON success message on HTTP 200.
+        JSON success message on HTTP 200, whether or not an account uses the email,
+        so the endpoint cannot be used to enumerate registered addresses.
         400 Bad Request if email is missing.
-        404 Not Found if no user matches the email.
     """
-    data = request.get_json()
-    session = current_app.config['SESSION_LOCAL']()
+    session = current_app.config['SESSION_LOCAL']
 
     try:
         user_service = UserService(session)
-        user_service.request_password_reset(data.get("email"))
+        user_service.request_password_reset(payload.email)
         return jsonify({
                            "message": "Password reset request received. Instructions will be sent to your email."}), HttpStatus.OK
 
     except ValueError as error:
         return jsonify({"error": str(error)}), HttpStatus.BAD_REQUEST
 
-    except Exception as error:
-        return jsonify({"error": str(error)}), HttpStatus.INTERNAL_SERVER_ERROR
-
-    finally:
-        session.close()
-
 @user_bp.route("/password-reset", methods=["POST"])
-def password_reset():
+@validate_body(PasswordResetRequest)
+def password_reset(payload):
     """
     Reset a user's password using a reset token.
 
@@ -339,30 +299,23 @@ def password_reset():
         404 Not Found: If the user linked to the token does not exist.
         500 Internal Server Error: If an unexpected error occurs.
     """
-    data = request.get_json()
-    session = current_app.config['SESSION_LOCAL']()
+    session = current_app.config['SESSION_LOCAL']
 
     try:
         user_service = UserService(session)
         user_service.reset_password(
-            data.get("token"),
-            data.get("new_password"),
-            data.get("confirm_password")
+            payload.token,
+            payload.new_password,
+            payload.confirm_password
         )
         return jsonify({"message": "Password has been reset successfully"}), HttpStatus.OK
 
     except ValueError as error:
         return jsonify({"error": str(error)}), HttpStatus.BAD_REQUEST
 
-    except Exception as error:
-        session.rollback()
-        return jsonify({"error": str(error)}), HttpStatus.INTERNAL_SERVER_ERROR
-
-    finally:
-        session.close()
-
 @user_bp.route("/login", methods=["POST"])
-def login():
+@validate_body(LoginRequest)
+def login(payload):
     """
     Authenticates a user and creates a session.
 
@@ -374,20 +327,16 @@ def login():
         400 Bad Request if username or password is missing.
         401 Unauthorized if credentials are invalid.
     """
-    data = request.get_json()
-    session = current_app.config['SESSION_LOCAL']()
+    session = current_app.config['SESSION_LOCAL']
 
     try:
         user_service = UserService(session)
         user = user_service.authenticate_user(
-            data.get("username"),
-            data.get("password"),
+            payload.username,
+            payload.password,
         )
-        login_user(user)
+        login_user(SessionUser.for_user(user))
         return jsonify({"message": "Login successful", "user_id": user.id}), HttpStatus.OK
 
     except ValueError as error:
         return jsonify({"error": str(error)}), HttpStatus.UNAUTHORIZED
-
-    finally:
-        session.close()
\ No newline at end of file
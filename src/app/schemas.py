@@ -0,0 +1,96 @@
+from functools import wraps
+
+import msgspec
+
+from flask import jsonify, request
+
+from src.utils.constants import HttpStatus
+
+
+def validate_body(schema):
+    """
+    Decorator that decodes the JSON request body into `schema` before the view runs.
+
+    The body is read once without being cached on the request and decoded in a single
+    pass with `msgspec`. Malformed JSON or wrongly typed fields are answered with
+    400 Bad Request without entering the view (and therefore without touching the
+    database session); otherwise the decoded struct is passed to the view as the
+    `payload` keyword argument.
+
+    Args:
+        schema (type[msgspec.Struct]): The struct type describing the expected body.
+
+    Returns:
+        callable: The decorator to apply to a view function.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                payload = msgspec.json.decode(request.get_data(cache=False), type=schema)
+            except msgspec.DecodeError as error:
+                return jsonify({"error": str(error)}), HttpStatus.BAD_REQUEST
+            return view(*args, payload=payload, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Fields are optional at the schema level so that missing values are still reported with
+# the specific `ErrorMessages` raised by the services; only wrongly typed values are
+# rejected by the decoder itself.
+
+class CheckAnswerRequest(msgspec.Struct):
+    """Body of `POST /llm/check-answer`."""
+    question: str | None = None
+    correct_answer: str | None = None
+    user_answer: str | None = None
+    language: str | None = None
+
+
+class StoreNoteRequest(msgspec.Struct):
+    """Body of `POST /note/store-note`."""
+    title: str | None = None
+    content: str | None = None
+
+
+class UpdateNoteRequest(msgspec.Struct):
+    """Body of `PUT /note/update-note/<note_id>`."""
+    title: str | None = None
+    content: str | None = None
+
+
+class CreateUserRequest(msgspec.Struct):
+    """Body of `POST /user/create-user`."""
+    username: str | None = None
+    email: str | None = None
+    password: str | None = None
+
+
+class UpdateUserRequest(msgspec.Struct):
+    """Body of `PUT /user/update-user/<user_id>`."""
+    username: str | None = None
+    email: str | None = None
+
+
+class ChangePasswordRequest(msgspec.Struct):
+    """Body of `POST /user/change-password/<user_id>`."""
+    current_password: str | None = None
+    new_password: str | None = None
+
+
+class PasswordResetEmailRequest(msgspec.Struct):
+    """Body of `POST /user/request-password-reset`."""
+    email: str | None = None
+
+
+class PasswordResetRequest(msgspec.Struct):
+    """Body of `POST /user/password-reset`."""
+    token: str | None = None
+    new_password: str | None = None
+    confirm_password: str | None = None
+
+
+class LoginRequest(msgspec.Struct):
+    """Body of `POST /user/login`."""
+    username: str | None = None
+    password: str | None = None
@@ -1,4 +1,8 @@
+from sqlalchemy import delete, insert, select
+
 from src.data.models.flashcards import Flashcard
+from src.data.models.quizzes import Quiz
+from src.data.models.scores import Score
 
 class FlashcardService:
     def __init__(self, session):
@@ -8,26 +12,29 @@ class FlashcardService:
         """
         Speichert neue Flashcards für eine Note und löscht vorherige.
 
+        Vorherige Flashcards werden per Bulk-DELETE entfernt, neue mit einem einzigen
+        executemany-INSERT ohne ORM-Objekte angelegt; beides in einer Transaktion.
+
         Args:
             note_id (int): ID der Note, zu der die Flashcards gehören.
-            flashcards_data (list[dict]): Liste mit Flashcard-Daten (question, answer).
+            flashcards_data (list[dict]): Flashcard-Daten (question, answer). Der type wird
+                nicht übergeben; die Datenbank setzt ihren server_default "text".
 
         """
-        existing_cards = self.session.query(Flashcard).filter(Flashcard.note_id == note_id).all()
-        for card in existing_cards:
-            self.session.delete(card)
+        self.clear_flashcards(note_id)
 
-        for card in flashcards_data:
-            flashcard = Flashcard(
-                question=card['question'],
-                answer=card['answer'],
-                type=card.get('type', ''),
-                note_id=note_id,
-                learned=False,
-                last_studied=None,
-                times_reviewed=0
-            )
-            self.session.add(flashcard)
+        rows = [
+            {
+                "question": card['question'],
+                "answer": card['answer'],
+                "note_id": note_id,
+                "learned": False,
+                "last_studied": None,
+                "times_reviewed": 0,
+            }
+            for card in flashcards_data
+        ]
+        self.session.execute(insert(Flashcard), rows)
 
         self.session.commit()
 
@@ -45,12 +52,34 @@ class FlashcardService:
 
     def delete_flashcards_for_note(self, note_id: int) -> None:
         """
-        Löscht alle Flashcards zu einer Note.
+        Löscht alle Flashcards zu einer Note und committet.
+
+        Nutzt die Bulk-DELETEs aus `clear_flashcards`, statt jede Karte zu laden und
+        einzeln zu löschen.
 
         Args:
             note_id (int): Note-ID
         """
-        cards = self.session.query(Flashcard).filter(Flashcard.note_id == note_id).all()
-        for c in cards:
-            self.session.delete(c)
+        self.clear_flashcards(note_id)
         self.session.commit()
+
+    def clear_flashcards(self, note_id: int) -> None:
+        """
+        Löscht alle Flashcards einer Note samt abhängiger Quizzes und Scores per Bulk-DELETE.
+
+        Ersetzt die ORM-Kaskade (`delete-orphan`), die sonst jede Karte einzeln laden würde.
+        Committet nicht; der Aufrufer entscheidet über Commit oder Rollback.
+
+        Args:
+            note_id (int): Note-ID
+        """
+        card_ids = select(Flashcard.card_id).where(Flashcard.note_id == note_id)
+        self.session.execute(
+            delete(Score).where(Score.card_id.in_(card_ids)).execution_options(synchronize_session=False)
+        )
+        self.session.execute(
+            delete(Quiz).where(Quiz.card_id.in_(card_ids)).execution_options(synchronize_session=False)
+        )
+        self.session.execute(
+            delete(Flashcard).where(Flashcard.note_id == note_id).execution_options(synchronize_session=False)
+        )
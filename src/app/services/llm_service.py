@@ -1,5 +1,20 @@
+import hashlib
+
 from src.data.models.notes import Note
 from src.utils.constants import ErrorMessages
+from src.utils.llm_api import SUMMARY_NOT_EXTRACTED, SUMMARY_NOT_GENERATED
+
+def content_hash(content: str) -> str:
+    """
+    Returns the 128-bit BLAKE2b hex digest used to detect unchanged note content.
+
+    Args:
+        content (str): The note content to hash.
+
+    Returns:
+        str: The hex digest.
+    """
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
 
 class LLMService:
     def __init__(self, session):
@@ -15,17 +30,25 @@ class LLMService:
         """
         Generates flashcards from the AI summary of a specified note and saves them using the flashcard service.
 
+        All flashcards are generated before the database is touched, so the existing flashcards
+        are replaced in one short transaction instead of a write lock being held for the LLM
+        request. If no flashcards are generated, e.g. because the completion was cut off, the
+        existing ones are kept rather than replaced by a partial set.
+
         Args:
             note_id (int): The ID of the note for which flashcards should be generated.
             user_id (int): The ID of the user owning the note.
-            generate_flashcards_from_summary (callable): Function generating flashcards from a summary.
+            generate_flashcards_from_summary (callable): Function returning the list of flashcards for a summary.
             flashcard_service (FlashcardService): Service to handle flashcard DB operations.
 
         Raises:
             ValueError: If the note does not exist or no AI summary is available.
         """
-        note = self.session.query(Note).filter(Note.note_id == note_id, Note.user_id == user_id).first()
-        if not note:
+        note = self.session.query(Note.ai_summary, Note.language).filter(
+            Note.note_id == note_id,
+            Note.user_id == user_id
+        ).first()
+        if note is None:
             raise ValueError(ErrorMessages.NOTE_NOT_FOUND)
         if not note.ai_summary:
             raise ValueError(ErrorMessages.NO_SUMMARY_AVAILABLE)
@@ -35,13 +58,16 @@ class LLMService:
             return
 
         flashcard_service.save_flashcards(note_id, flashcards_data)
-        self.session.commit()
 
     def generate_summary(self, note_id: int, user_id: int, generate_summary_from_note) -> tuple[
         str, str]:
         """
         Generates an AI summary for the original content of a specified note and updates the note in the database.
 
+        If the note already has a summary generated from identical content (same `content_hash`),
+        the stored summary and language are returned without calling the LLM. Fallback texts from a
+        failed generation are stored without a hash so the next request retries.
+
         Args:
             note_id (int): The ID of the note to summarize.
             user_id (int): The ID of the user who owns the note.
@@ -53,20 +79,75 @@ class LLMService:
         Raises:
             ValueError: If the note does not exist or the original content is empty.
         """
-        note = self.session.query(Note).filter(Note.note_id == note_id,
-                                               Note.user_id == user_id).first()
-        if not note:
+        owned_note = self.session.query(Note).filter(Note.note_id == note_id,
+                                                     Note.user_id == user_id)
+        note = owned_note.with_entities(
+            Note.original, Note.ai_summary, Note.language, Note.content_hash
+        ).first()
+        if note is None:
             raise ValueError(ErrorMessages.NOTE_NOT_FOUND)
         if not note.original:
             raise ValueError(ErrorMessages.EMPTY_NOTE_CONTENT)
 
+        original_hash = content_hash(note.original)
+        if note.ai_summary and note.content_hash == original_hash:
+            return note.ai_summary, note.language
+
         summary, language = generate_summary_from_note(note.original)
-        note.ai_summary = summary
-        note.language = language
+        summary_failed = summary in (SUMMARY_NOT_EXTRACTED, SUMMARY_NOT_GENERATED)
+        owned_note.update({
+            Note.ai_summary: summary,
+            Note.language: language,
+            Note.content_hash: None if summary_failed else original_hash
+        })
         self.session.commit()
 
         return summary, language
 
+    def generate_summary_and_flashcards(self, note_id: int, user_id: int, generate_summary_and_flashcards,
+                                        flashcard_service) -> tuple[str, str, int]:
+        """
+        Generates the AI summary and the flashcards of a specified note with a single LLM request.
+
+        The note's summary, language and content hash are updated as in `generate_summary`, and
+        its flashcards are replaced in the same transaction. If the summary could not be
+        generated or no flashcards were returned, the existing flashcards are kept.
+
+        Args:
+            note_id (int): The ID of the note to process.
+            user_id (int): The ID of the user who owns the note.
+            generate_summary_and_flashcards (callable): A function returning summary, language and flashcards for note content.
+            flashcard_service (FlashcardService): Service to handle flashcard DB operations.
+
+        Returns:
+            tuple[str, str, int]: The generated summary, the detected language and the number of saved flashcards.
+
+        Raises:
+            ValueError: If the note does not exist or the original content is empty.
+        """
+        owned_note = self.session.query(Note).filter(Note.note_id == note_id,
+                                                     Note.user_id == user_id)
+        note = owned_note.with_entities(Note.original).first()
+        if note is None:
+            raise ValueError(ErrorMessages.NOTE_NOT_FOUND)
+        if not note.original:
+            raise ValueError(ErrorMessages.EMPTY_NOTE_CONTENT)
+
+        summary, language, flashcards = generate_summary_and_flashcards(note.original)
+        summary_failed = summary in (SUMMARY_NOT_EXTRACTED, SUMMARY_NOT_GENERATED)
+        owned_note.update({
+            Note.ai_summary: summary,
+            Note.language: language,
+            Note.content_hash: None if summary_failed else content_hash(note.original)
+        })
+
+        if summary_failed or not flashcards:
+            self.session.commit()
+            return summary, language, 0
+
+        flashcard_service.save_flashcards(note_id, flashcards)
+        return summary, language, len(flashcards)
+
     def check_answer(self, question: str, correct_answer: str, user_answer: str, language: str,
                      check_user_answer_with_llm) -> dict:
         """
@@ -85,6 +166,6 @@ class LLMService:
         Raises:
             ValueError: If any of the required fields are missing.
         """
-        if not all([question, correct_answer, user_answer, language]):
+        if not question or not correct_answer or not user_answer or not language:
             raise ValueError("Missing required fields")
         return check_user_answer_with_llm(question, correct_answer, user_answer, language)
\ No newline at end of file
@@ -1,7 +1,13 @@
+from datetime import datetime
+
+from sqlalchemy import Result, Row, delete, func, select, update
+
 from src.config.config import Config
 from src.data.models.notes import Note
 from src.utils.constants import ErrorMessages
 
+NOTE_STREAM_BATCH_SIZE = 500
+
 class NoteService:
     def __init__(self, session):
         """
@@ -59,36 +65,80 @@ class NoteService:
         """
         Retrieves a single note by its ID and the owning user ID.
 
+        Uses `Session.get`, which is served from the identity map when the note was
+        already loaded in this session; ownership is checked in Python afterwards.
+
         Args:
             note_id (int): The ID of the requested note.
             user_id (int): The ID of the user who owns the note.
 
         Returns:
-            Note | None: The Note object if found, otherwise None.
+            Note | None: The Note object if found and owned by the user, otherwise None.
         """
-        note = self.session.query(Note).filter(
-            Note.note_id == note_id,
-            Note.user_id == user_id
-        ).first()
+        note = self.session.get(Note, note_id)
+        if note is None or note.user_id != user_id:
+            return None
         return note
 
-    def get_all_notes_for_user(self, user_id: int) -> list[Note]:
+    def get_all_notes_for_user(self, user_id: int) -> list[Row]:
         """
-        Retrieves all notes belonging to a specific user.
+        Retrieves the ID and title of all notes belonging to a specific user.
+
+        Only the two listed columns are selected, so the note bodies and summaries
+        are neither transferred nor hydrated into ORM objects.
 
         Args:
             user_id (int): The ID of the user whose notes to retrieve.
 
         Returns:
-            list[Note]: A list of all notes for the user (empty if none).
+            list[Row]: Rows with `note_id` and `title` attributes (empty if none).
+        """
+        return self.stream_notes_for_user(user_id).all()
+
+    def stream_notes_for_user(self, user_id: int) -> Result:
+        """
+        Like `get_all_notes_for_user`, but returns the open result instead of a list.
+
+        Rows are fetched from the cursor in batches of `NOTE_STREAM_BATCH_SIZE` while the
+        result is iterated, so memory stays constant regardless of the number of notes.
+
+        Args:
+            user_id (int): The ID of the user whose notes to retrieve.
+
+        Returns:
+            Result: An iterable of rows with `note_id` and `title` attributes.
+        """
+        return self.session.execute(
+            select(Note.note_id, Note.title)
+            .where(Note.user_id == user_id)
+            .execution_options(yield_per=NOTE_STREAM_BATCH_SIZE)
+        )
+
+    def get_notes_version(self, user_id: int) -> tuple[int, datetime | None]:
+        """
+        Returns a cheap version marker for a user's note list.
+
+        A single aggregate query yields the number of notes and the latest `updated_at`;
+        any create, update or delete changes at least one of them.
+
+        Args:
+            user_id (int): The ID of the user whose notes to check.
+
+        Returns:
+            tuple[int, datetime | None]: The note count and the latest modification time (None if no notes).
         """
-        return self.session.query(Note).filter(Note.user_id == user_id).all()
+        count, last_updated = self.session.execute(
+            select(func.count(Note.note_id), func.max(Note.updated_at)).where(Note.user_id == user_id)
+        ).one()
+        return count, last_updated
 
     def update_note(self, note_id: int, user_id: int, title: str = None,
                     content: str = None) -> bool:
         """
         Updates the title and/or content of an existing note.
 
+        Ownership check and update happen in a single `UPDATE ... RETURNING` statement.
+
         Args:
             note_id (int): The ID of the note to update.
             user_id (int): The ID of the user who owns the note.
@@ -98,15 +148,22 @@ class NoteService:
         Returns:
             bool: True if the note was found and updated, False otherwise.
         """
-        note = self.session.query(Note).filter(Note.note_id == note_id,
-                                               Note.user_id == user_id).first()
-        if not note:
-            return False
+        owned_note = (Note.note_id == note_id, Note.user_id == user_id)
 
+        values = {}
         if title:
-            note.title = title
+            values["title"] = title
         if content:
-            note.original = content
+            values["original"] = content
+
+        if not values:
+            return self.session.execute(select(Note.note_id).where(*owned_note)).first() is not None
+
+        updated = self.session.execute(
+            update(Note).where(*owned_note).values(**values).returning(Note.note_id)
+        ).first()
+        if updated is None:
+            return False
 
         self.session.commit()
         return True
@@ -115,6 +172,9 @@ class NoteService:
         """
         Deletes a note by its ID and owning user ID.
 
+        Ownership is part of the single DELETE statement, so the note is never loaded;
+        its flashcards, quizzes and scores are removed by the `ON DELETE CASCADE` keys.
+
         Args:
             note_id (int): The ID of the note to delete.
             user_id (int): The ID of the user who owns the note.
@@ -122,11 +182,10 @@ class NoteService:
         Returns:
             bool: True if the note was found and deleted, False otherwise.
         """
-        note = self.session.query(Note).filter(Note.note_id == note_id,
-                                               Note.user_id == user_id).first()
-        if not note:
-            return False
-
-        self.session.delete(note)
+        result = self.session.execute(
+            delete(Note)
+            .where(Note.note_id == note_id, Note.user_id == user_id)
+            .execution_options(synchronize_session=False)
+        )
         self.session.commit()
-        return True
\ No newline at end of file
+        return result.rowcount == 1
\ No newline at end of file
@@ -1,14 +1,13 @@
-from datetime import datetime
-from sqlalchemy import and_
+from sqlalchemy import Result, and_, case, distinct, func, insert, select, update
 
 from sqlalchemy.orm import Session
 
 from src.data.models import Note, Score
-from src.config.config import Config
 from src.data.models.quizzes import Quiz
 from src.data.models.flashcards import Flashcard
-from src.utils.llm_api import check_user_answer_with_llm
+from src.utils.llm_api import check_user_answer_cached
 
+FLASHCARD_STREAM_BATCH_SIZE = 200
 
 
 class QuizService:
@@ -41,7 +40,7 @@ class QuizService:
         if quiz:
             return quiz # type: ignore
 
-        quiz = Quiz(user_id=user_id, note_id=note_id, completed=False, created_at=Config.UTC)
+        quiz = Quiz(user_id=user_id, note_id=note_id, completed=False)
         self.db.add(quiz)
         self.db.commit()
         self.db.refresh(quiz)
@@ -51,6 +50,9 @@ class QuizService:
         """
         Retrieves all flashcards for a specific note to build a quiz.
 
+        Only the three needed columns are selected in a single JOIN, so no Flashcard
+        objects are hydrated.
+
         Args:
             user_id (int): ID of the current user.
             note_id (int): ID of the note to fetch flashcards from.
@@ -58,18 +60,36 @@ class QuizService:
         Returns:
             list[dict]: A list of flashcards with their card_id, question, and type.
         """
-        flashcards = (
-            self.db.query(Flashcard)
-            .join(Flashcard.note)
-            .filter(and_(Flashcard.note_id == note_id, Note.user_id == user_id))
-            .all()
+        return [dict(row) for row in self.stream_flashcards_for_quiz(user_id, note_id).mappings()]
+
+    def stream_flashcards_for_quiz(self, user_id: int, note_id: int) -> Result:
+        """
+        Like `get_flashcards_for_quiz`, but returns the open result instead of a list.
+
+        Rows are fetched from the cursor in batches of `FLASHCARD_STREAM_BATCH_SIZE` while the
+        result is iterated, so large notes are never held in memory all at once.
+
+        Args:
+            user_id (int): ID of the current user.
+            note_id (int): ID of the note to fetch flashcards from.
+
+        Returns:
+            Result: An iterable of rows with `card_id`, `question` and `type`.
+        """
+        return self.db.execute(
+            select(Flashcard.card_id, Flashcard.question, Flashcard.type)
+            .join(Note, Flashcard.note_id == Note.note_id)
+            .where(Flashcard.note_id == note_id, Note.user_id == user_id)
+            .execution_options(yield_per=FLASHCARD_STREAM_BATCH_SIZE)
         )
-        return [{"card_id": fc.card_id, "question": fc.question, "type": fc.type or "text"} for fc in flashcards]
 
     def get_next_flashcard_for_quiz(self, quiz_id: int, note_id: int) -> dict | None:
         """
         Returns the next flashcard that has not yet been answered in the given quiz.
 
+        The unanswered card is found in SQL with an anti-join against the quiz's scores,
+        so only that one row is fetched.
+
         Args:
             quiz_id (int): ID of the quiz session.
             note_id (int): ID of the note from which to fetch flashcards.
@@ -77,32 +97,24 @@ class QuizService:
         Returns:
             dict | None: The next flashcard as a dict with keys 'card_id', 'question', 'type', or None if all are answered.
         """
-        answered_card_ids = (
-            self.db.query(Score.card_id)
-            .filter(and_(Score.quiz_id == quiz_id))
-            .all()
-        )
-        answered_card_ids = {c[0] for c in answered_card_ids}
-
-        all_flashcards = (
-            self.db.query(Flashcard)
-            .filter(and_(Flashcard.note_id == note_id))
-            .all()
-        )
-
-        for card in all_flashcards:
-            if card.card_id not in answered_card_ids:
-                return {
-                    "card_id": card.card_id,
-                    "question": card.question,
-                    "type": card.type or "text",
-                }
-        return None
+        card = self.db.execute(
+            select(Flashcard.card_id, Flashcard.question, Flashcard.type)
+            .outerjoin(Score, and_(Score.card_id == Flashcard.card_id, Score.quiz_id == quiz_id))
+            .where(Flashcard.note_id == note_id, Score.score_id.is_(None))
+            .order_by(Flashcard.card_id)
+            .limit(1)
+        ).mappings().first()
+        return dict(card) if card else None
 
     def submit_answer(self, user_id: int, quiz_id: int, card_id: int, user_answer: str) -> dict:
         """
         Submits a user's answer for a flashcard question and evaluates it using the LLM.
 
+        Flashcard, note language and quiz are checked in one query before the LLM is called,
+        so a missing quiz fails without a paid request. The read transaction is ended before
+        the call, so no pooled connection is held while waiting for the LLM; the feedback is
+        then written with a single UPDATE.
+
         Args:
             user_id (int): ID of the current user.
             quiz_id (int): ID of the quiz session.
@@ -115,28 +127,38 @@ class QuizService:
         Raises:
             ValueError: If the flashcard or quiz session is not found.
         """
-        flashcard = self.db.query(Flashcard).filter_by(card_id=card_id).first()
+        flashcard = self.db.execute(
+            select(
+                Flashcard.question,
+                Flashcard.answer,
+                func.coalesce(Note.language, "en").label("language"),
+                Quiz.quiz_id,
+            )
+            .outerjoin(Note, Flashcard.note_id == Note.note_id)
+            .outerjoin(Quiz, Quiz.quiz_id == quiz_id)
+            .where(Flashcard.card_id == card_id)
+        ).first()
         if not flashcard:
             raise ValueError("Flashcard not found")
+        if flashcard.quiz_id is None:
+            raise ValueError("Quiz session not found")
 
-        language = flashcard.note.language if flashcard.note else "en"
+        language = flashcard.language
 
-        feedback = check_user_answer_with_llm(
+        self.db.commit()
+
+        feedback = check_user_answer_cached(
             flashcard.question,
             flashcard.answer,
             user_answer,
             language
         )
 
-        quiz = self.db.query(Quiz).filter_by(quiz_id=quiz_id).first()
-        if not quiz:
-            raise ValueError("Quiz session not found")
-
-        quiz.answer = user_answer
-        quiz.ai_feedback = feedback.get("evaluation", "")
-        quiz.answered = True
-
-        self.db.add(quiz)
+        self.db.execute(
+            update(Quiz)
+            .where(Quiz.quiz_id == quiz_id)
+            .values(answer=user_answer, ai_feedback=feedback.get("evaluation", ""), answered=True)
+        )
         self.db.commit()
 
         return feedback
@@ -150,19 +172,34 @@ class QuizService:
             card_id (int): ID of the flashcard.
             correct (bool): Whether the user's answer was correct.
         """
-        score = Score(
-            quiz_id=quiz_id,
-            card_id=card_id,
-            checked_answer=correct,
-            answered=Config.UTC
+        self.save_user_answers(quiz_id, [(card_id, correct)])
+
+    def save_user_answers(self, quiz_id: int, answers: list[tuple[int, bool]]):
+        """
+        Saves the correctness of several answers of a quiz in one transaction.
+
+        All rows go out as a single executemany INSERT without building Score objects,
+        and are committed together; the `answered` timestamp is set by the database.
+
+        Args:
+            quiz_id (int): ID of the quiz session.
+            answers (list[tuple[int, bool]]): Pairs of flashcard ID and whether the answer was correct.
+        """
+        if not answers:
+            return
+        self.db.execute(
+            insert(Score),
+            [{"quiz_id": quiz_id, "card_id": card_id, "checked_answer": correct} for card_id, correct in answers]
         )
-        self.db.add(score)
         self.db.commit()
 
     def get_progress(self, user_id: int, note_id: int) -> dict:
         """
         Calculates quiz progress for a user on a given note.
 
+        Both counts come from one aggregate over the note's flashcards, outer-joined to the
+        user's quiz attempts.
+
         Args:
             user_id (int): ID of the current user.
             note_id (int): ID of the note.
@@ -170,21 +207,14 @@ class QuizService:
         Returns:
             dict: Contains total flashcards, answered flashcards, and progress percentage.
         """
-        total = (
-            self.db.query(Flashcard)
-            .filter_by(note_id=note_id)
-            .count()
-        )
-        answered = (
-            self.db.query(Quiz)
-            .join(Quiz.flashcard)
-            .filter(and_(
-                Quiz.user_id == user_id,
-                Flashcard.note_id == note_id,
-                Quiz.answered.is_(True)
-            ))
-            .count()
-        )
+        total, answered = self.db.execute(
+            select(
+                func.count(distinct(Flashcard.card_id)),
+                func.coalesce(func.sum(case((Quiz.answered.is_(True), 1), else_=0)), 0),
+            )
+            .outerjoin(Quiz, and_(Quiz.card_id == Flashcard.card_id, Quiz.user_id == user_id))
+            .where(Flashcard.note_id == note_id)
+        ).one()
         return {
             "total_flashcards": total,
             "answered_flashcards": answered,
@@ -1,8 +1,11 @@
+from sqlalchemy import or_, select
+
 from src.data.models import User, Note, Flashcard
 from  src.utils.constants import ErrorMessages
-from src.utils.email_utils import send_reset_email
+from src.utils.email_utils import queue_reset_email
 from src.utils.token import generate_reset_token, verify_reset_token
 
+USER_STREAM_BATCH_SIZE = 500
 
 class UserService:
     def __init__(self, session):
@@ -34,11 +37,7 @@ class UserService:
         if not username or not email or not password:
             raise ValueError("Username, email and password are required")
 
-        if self.session.query(User).filter_by(username=username).first():
-            raise ValueError(ErrorMessages.USER_ALREADY_EXISTS)
-
-        if self.session.query(User).filter_by(email=email).first():
-            raise ValueError(ErrorMessages.EMAIL_ALREADY_EXISTS)
+        self._ensure_unique(username, email)
 
         user = User(username=username, email=email)
         user.set_password(password)
@@ -48,10 +47,47 @@ class UserService:
 
         return user
 
+    def _ensure_unique(self, username=None, email=None, exclude_user_id=None):
+        """
+        Checks that neither the username nor the email is taken by another user.
+
+        Both values are looked up in a single query that only selects the two columns and
+        stops after two rows (one per unique column at most); if both collide, the username
+        conflict is reported.
+
+        Args:
+            username (str, optional): Username to check. Skipped if empty.
+            email (str, optional): Email address to check. Skipped if empty.
+            exclude_user_id (int, optional): ID of the user being updated, whose own values don't count.
+
+        Raises:
+            ValueError: If the username or email already belongs to another user.
+        """
+        conditions = []
+        if username:
+            conditions.append(User.username == username)
+        if email:
+            conditions.append(User.email == email)
+        if not conditions:
+            return
+
+        stmt = select(User.username, User.email).where(or_(*conditions))
+        if exclude_user_id is not None:
+            stmt = stmt.where(User.id != exclude_user_id)
+        taken = self.session.execute(stmt.limit(2)).all()
+
+        if username and any(row.username == username for row in taken):
+            raise ValueError(ErrorMessages.USER_ALREADY_EXISTS)
+        if taken:
+            raise ValueError(ErrorMessages.EMAIL_ALREADY_EXISTS)
+
     def get_user_if_authorized(self, user_id, requesting_user_id):
         """
         Retrieves a user if the requesting user is authorized to access them.
 
+        The user is fetched with `Session.get`, so a row already loaded in this session is
+        served from the identity map.
+
         Args:
             user_id (int): ID of the user to retrieve.
             requesting_user_id (int): ID of the user making the request.
@@ -64,7 +100,7 @@ class UserService:
             PermissionError: If access is unauthorized.
         """
 
-        user = self.session.query(User).filter_by(id=user_id).first()
+        user = self.session.get(User, user_id)
 
         if not user:
             raise ValueError(ErrorMessages.USER_NOT_FOUND)
@@ -91,23 +127,14 @@ class UserService:
             ValueError: If the user does not exist or username/email already taken.
             PermissionError: If the requesting user is not authorized.
         """
-        user = self.session.query(User).filter_by(id=user_id).first()
-
-        if not user:
-            raise ValueError(ErrorMessages.USER_NOT_FOUND)
+        user = self.get_user_if_authorized(user_id, requesting_user_id)
 
-        if user.id != requesting_user_id:
-            raise PermissionError(ErrorMessages.UNAUTHORIZED_ACCESS)
+        self._ensure_unique(username, email, exclude_user_id=user.id)
 
         if username:
-            if self.session.query(User).filter(User.username == username,
-                                               User.id != user.id).first():
-                raise ValueError(ErrorMessages.USER_ALREADY_EXISTS)
             user.username = username
 
         if email:
-            if self.session.query(User).filter(User.email == email, User.id != user.id).first():
-                raise ValueError(ErrorMessages.EMAIL_ALREADY_EXISTS)
             user.email = email
 
         self.session.commit()
@@ -117,6 +144,9 @@ class UserService:
         """
         Deletes a user and all related notes and flashcards if authorized.
 
+        Notes, flashcards, quizzes and scores are removed by the database through the
+        `ON DELETE CASCADE` foreign keys, so a single DELETE on the user suffices.
+
         Args:
             user_id (int): ID of the user to delete.
             requesting_user_id (int): ID of the user making the request.
@@ -125,26 +155,17 @@ class UserService:
             ValueError: If the user does not exist.
             PermissionError: If the requesting user is not authorized.
         """
-        user = self.session.query(User).filter_by(id=user_id).first()
-
-        if not user:
-            raise ValueError(ErrorMessages.USER_NOT_FOUND)
-
-        if user.id != requesting_user_id:
-            raise PermissionError(ErrorMessages.UNAUTHORIZED_ACCESS)
-
-        self.session.query(Note).filter_by(user_id=user.id).delete()
-        self.session.query(Flashcard).filter_by(user_id=user.id).delete()
+        user = self.get_user_if_authorized(user_id, requesting_user_id)
 
         self.session.delete(user)
         self.session.commit()
 
-    def get_all_users_if_admin(self, requesting_user):
+    def get_all_users_if_admin(self, requesting_user_id):
         """
         Retrieves all users if the requesting user has admin privileges.
 
         Args:
-            requesting_user (User): The user making the request.
+            requesting_user_id (int): ID of the user making the request.
 
         Returns:
             List of dicts containing user id, username, and email.
@@ -152,19 +173,40 @@ class UserService:
         Raises:
             PermissionError: If the requesting user is not an admin.
         """
-        if not requesting_user.is_admin:
+        return list(self.stream_all_users_if_admin(requesting_user_id))
+
+    def stream_all_users_if_admin(self, requesting_user_id):
+        """
+        Like `get_all_users_if_admin`, but yields the users lazily.
+
+        The admin check runs immediately; rows are then fetched from the cursor in
+        batches of `USER_STREAM_BATCH_SIZE` as the returned generator is consumed.
+
+        Args:
+            requesting_user_id (int): ID of the user making the request.
+
+        Returns:
+            Generator of dicts containing user id, username, and email.
+
+        Raises:
+            PermissionError: If the requesting user is not an admin.
+        """
+        requesting_user = self.session.get(User, requesting_user_id)
+        if not requesting_user or not requesting_user.is_admin:
             raise PermissionError(ErrorMessages.UNAUTHORIZED_ACCESS)
 
-        users = self.session.query(User).all()
-        return [
-            {"id": user.id, "username": user.username, "email": user.email}
-            for user in users
-        ]
+        users = self.session.execute(
+            select(User.id, User.username, User.email).execution_options(yield_per=USER_STREAM_BATCH_SIZE)
+        ).mappings()
+        return (dict(user) for user in users)
 
     def fetch_flashcards_for_user(self, user_id: int, current_user_id: int) -> list[dict]:
         """
         Retrieves all flashcards belonging to the specified user if authorized.
 
+        Flashcards are owned through their note, so they are fetched with a single
+        flashcards-notes JOIN that selects only the returned columns.
+
         Args:
             user_id (int): ID of the user whose flashcards to fetch.
             current_user_id (int): ID of the user making the request.
@@ -176,14 +218,14 @@ class UserService:
             ValueError: If the user does not exist.
             PermissionError: If unauthorized access is attempted.
         """
-        user = self.session.query(User).filter_by(id=user_id).first()
-        if not user:
-            raise ValueError(ErrorMessages.USER_NOT_FOUND)
-        if user.id != current_user_id:
-            raise PermissionError(ErrorMessages.UNAUTHORIZED_ACCESS)
+        user = self.get_user_if_authorized(user_id, current_user_id)
 
-        flashcards = self.session.query(Flashcard).filter_by(user_id=user.id).all()
-        return [{"id": fc.id, "question": fc.question, "answer": fc.answer} for fc in flashcards]
+        flashcards = self.session.execute(
+            select(Flashcard.card_id.label("id"), Flashcard.question, Flashcard.answer)
+            .join(Note, Flashcard.note_id == Note.note_id)
+            .where(Note.user_id == user.id)
+        ).mappings()
+        return [dict(fc) for fc in flashcards]
 
     def change_password(self, user_id, requesting_user_id, current_password, new_password):
         """
@@ -203,21 +245,14 @@ class UserService:
             PermissionError: If unauthorized access is attempted.
         """
 
-        user = self.session.query(User).filter_by(id=user_id).first()
-
-        if not user:
-            raise ValueError(ErrorMessages.USER_NOT_FOUND)
-
-        if user.id != requesting_user_id:
-            raise PermissionError(ErrorMessages.UNAUTHORIZED_ACCESS)
-
         if not current_password or not new_password:
             raise ValueError(ErrorMessages.CURRENT_NEW_PASSWORD_REQUIRED)
 
-        if not user.verify_password(current_password):
+        user = self.get_user_if_authorized(user_id, requesting_user_id)
+
+        if not user.replace_password(current_password, new_password):
             raise ValueError(ErrorMessages.PASSWORD_INCORRECT)
 
-        user.set_password(new_password)
         self.session.commit()
         return True
 
@@ -225,25 +260,30 @@ class UserService:
         """
         Initiates a password reset process by sending a reset email with token.
 
+        The email is queued for background delivery, so the request does not wait for SMTP.
+        An unknown address is not an error: callers answer both cases identically, and since
+        both take one indexed lookup, neither the response nor its timing reveals whether an
+        account exists.
+
         Args:
             email (str): Email address of the user requesting reset.
 
         Returns:
-            True if reset email was sent successfully.
+            True if a reset email was queued, False if no user has this email.
 
         Raises:
-            ValueError: If email is missing or user with the email does not exist.
+            ValueError: If email is missing.
         """
         if not email:
             raise ValueError(ErrorMessages.EMAIL_REQUIRED)
 
-        user = self.session.query(User).filter_by(email=email).first()
+        user = self.session.execute(select(User.id, User.email).where(User.email == email)).first()
         if not user:
-            raise ValueError(ErrorMessages.USER_NOT_FOUND)
+            return False
 
         token = generate_reset_token(user.id)
         reset_url = f"https://in-development.com/reset-password?token={token}"
-        send_reset_email(user.email, reset_url)
+        queue_reset_email(user.email, reset_url)
 
         return True
 
@@ -272,7 +312,7 @@ class UserService:
         if not user_id:
             raise ValueError(ErrorMessages.EXPIRED_INVALID_TOKEN)
 
-        user = self.session.query(User).filter_by(id=user_id).first()
+        user = self.session.get(User, user_id)
         if not user:
             raise ValueError(ErrorMessages.USER_NOT_FOUND)
 
@@ -284,6 +324,10 @@ class UserService:
         """
         Authenticates a user by verifying the username and password.
 
+        A successful login with a hash in an outdated format (bcrypt, or Argon2 with older
+        parameters) stores a fresh Argon2id hash of the password, so accounts migrate as
+        their users sign in.
+
         Args:
             username (str): The username to authenticate.
             password (str): The password for the user.
@@ -298,8 +342,12 @@ class UserService:
         if not username or not password:
             raise ValueError(ErrorMessages.USERNAME_PASSWORD_REQUIRED)
 
-        user = self.session.query(User).filter_by(username=username).first()
+        user = self.session.execute(select(User).where(User.username == username)).scalar_one_or_none()
         if user is None or not user.verify_password(password):
             raise ValueError(ErrorMessages.INVALID_CREDENTIALS)
 
+        if user.password_needs_rehash:
+            user.set_password(password)
+            self.session.commit()
+
         return user
@@ -1,21 +1,31 @@
 import os
-from dotenv import load_dotenv
-from datetime import datetime, timezone
-
-load_dotenv()
 
 class Config:
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     SECRET_KEY = os.getenv("SECRET_KEY")
     DATABASE_URL = os.getenv("DATABASE_URL")
 
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING = True
+    DB_POOL_USE_LIFO = True
+    DB_RAISE_ON_LAZY_LOAD = False
+
+    COMPRESS_ALGORITHM = ["br", "gzip"]
+    COMPRESS_MIN_SIZE = 500
+    COMPRESS_MIMETYPES = ["application/json", "application/x-ndjson", "application/msgpack"]
+
     NOTE_TITLE_MAX_LENGTH = 100
     NOTE_CONTENT_MAX_LENGTH = 1000
 
-    UTC = timezone.utc
-
 class DevelopmentConfig(Config):
     DEBUG = True
 
+    DB_POOL_SIZE = 5
+    DB_MAX_OVERFLOW = 10
+    DB_RAISE_ON_LAZY_LOAD = True
+
 class ProductionConfig(Config):
     DEBUG = False
\ No newline at end of file
@@ -1,23 +1,74 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import sessionmaker, declarative_base, scoped_session
 
 Base = declarative_base()
 
-def get_engine(database_url: str):
+SQLITE_PRAGMAS = (
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+def _configure_sqlite_connection(dbapi_connection, _connection_record):
+    """
+    Applies `SQLITE_PRAGMAS` to a new SQLite connection.
+
+    Foreign keys are enforced so `ON DELETE CASCADE` applies. WAL lets readers proceed
+    while a write is in progress, and with `synchronous=NORMAL` a commit no longer waits
+    for its own fsync (the WAL is synced at checkpoints). The page cache (64 MiB),
+    in-memory temp tables and memory-mapped reads trade memory for fewer syscalls.
+    In-memory databases ignore the journal settings.
+    """
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+def get_engine(database_url: str, pool_size: int = 10, max_overflow: int = 20, pool_timeout: int = 30,
+               pool_recycle: int = 1800, pool_pre_ping: bool = True, pool_use_lifo: bool = True):
     """
     Creates and returns a SQLAlchemy engine for the given database URL.
 
-    The engine is configured to allow connections from multiple threads, which is
-    necessary for SQLite in testing environments.
+    SQLite engines are configured to allow connections from multiple threads, which is
+    necessary for SQLite in testing environments, and every connection is set up with
+    `SQLITE_PRAGMAS` (foreign keys, WAL journaling, relaxed sync). The pool options are not
+    passed for SQLite, so SQLAlchemy's defaults apply there (a default-sized `QueuePool` for
+    database files, a `SingletonThreadPool` for `:memory:`). Any other database gets a `QueuePool`
+    sized by the given options, with pre-ping to discard dead connections and recycling
+    to stay ahead of server-side idle timeouts. LIFO checkout keeps reusing the most
+    recently returned connection, so surplus connections sit idle and can be recycled.
 
     Args:
         database_url (str): The database connection string.
+        pool_size (int): Number of connections kept open in the pool.
+        max_overflow (int): Extra connections allowed beyond `pool_size` under load.
+        pool_timeout (int): Seconds to wait for a free connection before giving up.
+        pool_recycle (int): Seconds after which a pooled connection is replaced.
+        pool_pre_ping (bool): Whether to test connections for liveness on checkout.
+        pool_use_lifo (bool): Whether to check out the most recently returned connection first.
 
     Returns:
         Engine: A SQLAlchemy engine instance connected to the specified database.
     """
 
-    return create_engine(database_url, connect_args={"check_same_thread": False})
+    if make_url(database_url).get_backend_name() == "sqlite":
+        engine = create_engine(database_url, connect_args={"check_same_thread": False})
+        event.listen(engine, "connect", _configure_sqlite_connection)
+        return engine
+
+    return create_engine(
+        database_url,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_recycle=pool_recycle,
+        pool_pre_ping=pool_pre_ping,
+        pool_use_lifo=pool_use_lifo,
+    )
 
 def get_session_local(engine):
     """
@@ -34,12 +85,49 @@ def get_session_local(engine):
 
     return sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def _raise_on_lazy_load(orm_execute_state):
+    """Fails a lazy relationship load that is about to emit SQL (see `get_scoped_session`)."""
+    if not orm_execute_state.is_select:
+        return
+    state = orm_execute_state.lazy_loaded_from
+    if state is not None:
+        raise InvalidRequestError(
+            f"Lazy load on {state.class_.__name__} emitted SQL; "
+            "load the relationship eagerly or select the needed columns explicitly"
+        )
+
+def get_scoped_session(engine, raise_on_lazy_load=False):
+    """
+    Creates a thread-local `scoped_session` registry around the configured sessionmaker.
+
+    Calling the registry (or using it as a proxy) returns the same session for the
+    current thread until `remove()` is called, which the app does on teardown.
+
+    With `raise_on_lazy_load`, any lazy relationship load that needs a query raises
+    `InvalidRequestError`, so N+1 patterns in request handlers fail loudly in development
+    and tests instead of silently issuing one query per row. Loads answered from the
+    identity map are still allowed.
+
+    Args:
+        engine (Engine): SQLAlchemy engine to bind the sessions to.
+        raise_on_lazy_load (bool): Whether lazy loads that emit SQL should raise.
+
+    Returns:
+        scoped_session: A thread-local session registry.
+    """
+
+    registry = scoped_session(get_session_local(engine))
+    if raise_on_lazy_load:
+        event.listen(registry, "do_orm_execute", _raise_on_lazy_load)
+    return registry
+
 def init_db(engine_to_use):
     """
     Initializes the database schema by importing all model modules and creating their tables.
 
     This function ensures all ORM models are registered with SQLAlchemy's Base metadata
-    before invoking table creation on the provided engine.
+    before invoking table creation on the provided engine. Tables created by older versions
+    of the models are then brought up to date by `upgrade_schema`.
 
     Args:
         engine_to_use (Engine): SQLAlchemy engine used to apply the schema creation.
@@ -50,5 +138,7 @@ def init_db(engine_to_use):
     import src.data.models.notes
     import src.data.models.quizzes
     import src.data.models.scores
+    from src.data.upgrade import upgrade_schema
 
-    Base.metadata.create_all(bind=engine_to_use)
\ No newline at end of file
+    Base.metadata.create_all(bind=engine_to_use)
+    upgrade_schema(engine_to_use)
\ No newline at end of file
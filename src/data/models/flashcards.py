@@ -11,7 +11,7 @@ class Flashcard(Base):
         card_id (int): Primary key, unique identifier for the flashcard.
         question (str): The question or prompt shown to the user.
         answer (str): The correct answer or explanation.
-        type (str, optional): Category or tag for the flashcard.
+        type (str): Category or tag for the flashcard, "text" unless set otherwise.
         note_id (int, optional): Foreign key linking to a related note.
         learned (bool): Flag indicating if the flashcard has been marked as learned.
         last_studied (datetime, optional): Timestamp when the flashcard was last reviewed.
@@ -22,15 +22,15 @@ class Flashcard(Base):
     card_id = Column(Integer, primary_key=True, index=True)
     question = Column(Text, nullable=False)
     answer = Column(Text, nullable=False)
-    type = Column(String(50), nullable=True)
-    note_id = Column(Integer, ForeignKey("notes.note_id"), nullable=True)
+    type = Column(String(50), nullable=False, server_default="text")
+    note_id = Column(Integer, ForeignKey("notes.note_id", ondelete="CASCADE"), nullable=True, index=True)
     learned = Column(Boolean, default=False)
     last_studied = Column(DateTime, nullable=True)
     times_reviewed = Column(Integer, default=0)
 
     note = relationship("Note", back_populates="flashcards")
-    quizzes = relationship("Quiz", back_populates="flashcard", cascade="all, delete-orphan")
-    scores = relationship("Score", back_populates="flashcard", cascade="all, delete-orphan")
+    quizzes = relationship("Quiz", back_populates="flashcard", cascade="all, delete-orphan", passive_deletes=True)
+    scores = relationship("Score", back_populates="flashcard", cascade="all, delete-orphan", passive_deletes=True)
 
     def __repr__(self):
         return f"<Flashcard(card_id={self.card_id}, question={self.question})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, String
+from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, String, Index, func
 from sqlalchemy.orm import relationship
 from datetime import datetime, UTC
 
@@ -13,21 +13,31 @@ class Note(Base):
         original (str): The original text content provided by the user.
         ai_summary (str): AI-generated summary of the original content.
         created_at (datetime): Timestamp indicating when the note was created.
+        updated_at (datetime): Timestamp of the last change to the note, used as its cache validator.
         user_id (int): Foreign key referencing the associated user.
         language (str): Language of the note content, default is "en".
+        content_hash (str): BLAKE2b digest of `original` at the time `ai_summary` was generated.
     """
     __tablename__ = "notes"
+    __table_args__ = (
+        Index("ix_notes_user_id_note_id", "user_id", "note_id"),
+    )
 
     note_id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=True)
     original = Column(Text, nullable=False)
     ai_summary = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.now(UTC), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Updates are stamped in Python: SQLite's CURRENT_TIMESTAMP has one-second resolution, which
+    # would let two edits within a second share an ETag.
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=lambda: datetime.now(UTC),
+                        nullable=False)
     language = Column(String, nullable=True, default="en")
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    content_hash = Column(String(32), nullable=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
 
     user = relationship("User", back_populates="notes")
-    flashcards = relationship("Flashcard", back_populates="note")
+    flashcards = relationship("Flashcard", back_populates="note", cascade="all, delete-orphan", passive_deletes=True)
 
     def __repr__(self):
         return f"<Note(note_id={self.note_id}, user_id={self.user_id})>"
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Text, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, Text, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from src.data.db import Base
@@ -17,17 +17,20 @@ class Quiz(Base):
     """
 
     __tablename__ = "quizzes"
+    __table_args__ = (
+        Index("ix_quizzes_card_user_answered", "card_id", "user_id", "answered"),
+    )
 
     quiz_id = Column(Integer, primary_key=True, index=True)
     answer = Column(Text, nullable=False)
     ai_feedback = Column(Text, nullable=True)
     answered = Column(Boolean, default=False)
-    card_id = Column(Integer, ForeignKey("flashcards.card_id"), nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    card_id = Column(Integer, ForeignKey("flashcards.card_id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
 
     flashcard = relationship("Flashcard", back_populates="quizzes")
     user = relationship("User", back_populates="quizzes")
-    scores = relationship("Score", back_populates="quiz", cascade="all, delete-orphan")
+    scores = relationship("Score", back_populates="quiz", cascade="all, delete-orphan", passive_deletes=True)
 
     def __repr__(self):
         return (f"<Quiz(quiz_id={self.quiz_id}, user_id={self.user_id}, card_id={self.card_id}, "
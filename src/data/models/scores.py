@@ -1,6 +1,5 @@
-from sqlalchemy import Column, Integer, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Boolean, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
-from datetime import datetime
 
 from src.data.db import Base
 
@@ -17,12 +16,16 @@ class Score(Base):
     """
 
     __tablename__ = "scores"
+    __table_args__ = (
+        Index("ix_scores_quiz_card", "quiz_id", "card_id"),
+        Index("ix_scores_card", "card_id"),
+    )
 
     score_id = Column(Integer, primary_key=True, index=True)
-    card_id = Column(Integer, ForeignKey("flashcards.card_id"), nullable=False)
-    quiz_id = Column(Integer, ForeignKey("quizzes.quiz_id"), nullable=False)
+    card_id = Column(Integer, ForeignKey("flashcards.card_id", ondelete="CASCADE"), nullable=False)
+    quiz_id = Column(Integer, ForeignKey("quizzes.quiz_id", ondelete="CASCADE"), nullable=False)
     checked_answer = Column(Boolean, default=False)
-    answered = Column(DateTime, default=datetime.utcnow, nullable=False)
+    answered = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     flashcard = relationship("Flashcard", back_populates="scores")
     quiz = relationship("Quiz", back_populates="scores")
@@ -1,19 +1,39 @@
 import datetime
 
+import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from sqlalchemy import Column, Integer, String, DateTime, Boolean
 from email_validator import validate_email, EmailNotValidError
-from passlib.context import CryptContext
 from sqlalchemy.orm import relationship
 
 from src.data.db import Base
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+LEGACY_BCRYPT_PREFIX = "$2"
+EMAIL_VALIDATION_OPTIONS = {"check_deliverability": False}
+
+_password_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+
+def _hash_password(password: str) -> str:
+    return _password_hasher.hash(password)
+
+def _verify_password(password: str, password_hash: str) -> bool:
+    if password_hash.startswith(LEGACY_BCRYPT_PREFIX):
+        return bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("ascii"))
+    try:
+        return _password_hasher.verify(password_hash, password)
+    except (VerificationError, InvalidHashError):
+        return False
 
 class User(Base):
     """
     Database model for a user account.
 
+    Passwords are hashed with Argon2id (time cost 2, 19 MiB, one lane); bcrypt hashes from
+    before the switch still verify. Both libraries release the GIL while hashing, so
+    other request threads keep running.
+
     Attributes:
         id (int): Primary key, unique user identifier.
         username (str): Unique username chosen by the user.
@@ -28,6 +48,12 @@ class User(Base):
         verify_password(password: str) -> bool:
             Verifies a plaintext password against the stored password hash.
 
+        replace_password(current_password: str, new_password: str) -> bool:
+            Verifies the current password and, only if it matches, sets the new one.
+
+        password_needs_rehash -> bool:
+            Whether the stored hash is a legacy bcrypt hash or uses outdated Argon2 parameters.
+
         validate_user_email(email: str) -> str:
             Validates the format of an email address and returns the normalized form.
             Raises ValueError if the email is invalid.
@@ -41,22 +67,56 @@ class User(Base):
     is_admin = Column(Boolean, default=False)
     created_at = Column(DateTime, default=lambda: datetime.datetime.now(datetime.timezone.utc))
 
-    notes = relationship("Note", back_populates="user", cascade="all, delete-orphan")
-    quizzes = relationship("Quiz", back_populates="user", cascade="all, delete-orphan")
+    notes = relationship("Note", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    quizzes = relationship("Quiz", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
 
     def set_password(self, password: str):
         """Hashes and sets the user's password."""
-        self.password_hash = pwd_context.hash(password)
+        self.password_hash = _hash_password(password)
 
     def verify_password(self, password: str) -> bool:
         """Checks if the provided password matches the stored hash."""
-        return pwd_context.verify(password, self.password_hash)
+        return _verify_password(password, self.password_hash)
+
+    def replace_password(self, current_password: str, new_password: str) -> bool:
+        """
+        Verifies the current password and, if it matches, stores a hash of the new one.
+
+        The new password is only hashed after the current one has been verified, so a wrong
+        current password costs a single hash computation.
+
+        Args:
+            current_password (str): The password to check against the stored hash.
+            new_password (str): The password to store on success.
+
+        Returns:
+            bool: True if the current password matched and the new hash was set.
+        """
+        if not self.verify_password(current_password):
+            return False
+
+        self.set_password(new_password)
+        return True
+
+    @property
+    def password_needs_rehash(self) -> bool:
+        """Checks if the stored hash should be replaced by one with the current Argon2id parameters."""
+        if self.password_hash.startswith(LEGACY_BCRYPT_PREFIX):
+            return True
+        try:
+            return _password_hasher.check_needs_rehash(self.password_hash)
+        except InvalidHashError:
+            return True
 
     @staticmethod
     def validate_user_email(email: str) -> str:
         """
         Validates and normalizes an email address.
 
+        Only the syntax is checked (`EMAIL_VALIDATION_OPTIONS`); the DNS lookup for the
+        domain's mail servers is skipped, since it would block the request on a network
+        round-trip and can fail for valid addresses while the resolver is unreachable.
+
         Args:
             email (str): Email address to validate.
 
@@ -67,7 +127,7 @@ class User(Base):
             ValueError: If the email is not valid.
         """
         try:
-            valid = validate_email(email)
+            valid = validate_email(email, **EMAIL_VALIDATION_OPTIONS)
             return valid.normalized
         except EmailNotValidError as error:
             raise ValueError(f"Invalid email address: {error}")
@@ -0,0 +1,174 @@
+from sqlalchemy import MetaData, inspect
+from sqlalchemy.schema import AddConstraint
+
+from src.data.db import Base
+
+# Values for rows that predate a column or its NOT NULL constraint, as SQL expressions over the old row.
+BACKFILLS = {
+    ("notes", "updated_at"): "created_at",
+    ("flashcards", "type"): "'text'",
+}
+
+def _backfill(table_name, column):
+    """Returns the SQL expression that fills a NULL `column` of an existing row, or None."""
+    return BACKFILLS.get((table_name, column.name))
+
+def _outdated_parts(inspector, table):
+    """
+    Compares an existing table with its model definition.
+
+    Args:
+        inspector (Inspector): Inspector bound to the database.
+        table (Table): The model's table.
+
+    Returns:
+        tuple[list, list, list, list]: Missing columns, columns that should be NOT NULL,
+        columns missing their server default, and foreign keys whose ON DELETE differs.
+    """
+    existing = {column["name"]: column for column in inspector.get_columns(table.name)}
+    missing = [column for column in table.columns if column.name not in existing]
+    not_null = [
+        column for column in table.columns
+        if column.name in existing and not column.primary_key
+        and not column.nullable and existing[column.name]["nullable"]
+    ]
+    defaults = [
+        column for column in table.columns
+        if column.name in existing and column.server_default is not None
+        and existing[column.name]["default"] is None
+    ]
+
+    reflected_ondelete = {
+        tuple(fk["constrained_columns"]): ((fk.get("options") or {}).get("ondelete") or "").upper()
+        for fk in inspector.get_foreign_keys(table.name)
+    }
+    foreign_keys = [
+        constraint for constraint in table.foreign_key_constraints
+        if reflected_ondelete.get(tuple(constraint.column_keys), "") != (constraint.ondelete or "").upper()
+    ]
+    return missing, not_null, defaults, foreign_keys
+
+def _rebuild_sqlite_table(connection, table):
+    """
+    Recreates a SQLite table from its model definition and copies the rows over.
+
+    SQLite cannot alter constraints in place, so this follows its documented procedure:
+    create the new table under a temporary name, copy the rows (filling `BACKFILLS`),
+    drop the old table and rename the new one. Indexes are created afterwards by
+    `upgrade_schema`. Must run with foreign key enforcement turned off.
+
+    Args:
+        connection (Connection): Connection to the SQLite database.
+        table (Table): The model's table.
+    """
+    scratch = MetaData()
+    for model_table in Base.metadata.sorted_tables:
+        model_table.to_metadata(scratch)
+    temporary = table.to_metadata(scratch, name=f"_upgrade_{table.name}")
+    temporary.indexes.clear()
+    temporary.create(connection)
+
+    existing = {column["name"] for column in inspect(connection).get_columns(table.name)}
+    targets, sources = [], []
+    for column in table.columns:
+        fill = _backfill(table.name, column)
+        if column.name in existing:
+            source = f'"{column.name}"'
+            sources.append(f"COALESCE({source}, {fill})" if fill else source)
+        elif fill:
+            sources.append(fill)
+        else:
+            continue
+        targets.append(f'"{column.name}"')
+
+    connection.exec_driver_sql(
+        f'INSERT INTO "{temporary.name}" ({", ".join(targets)}) '
+        f'SELECT {", ".join(sources)} FROM "{table.name}"'
+    )
+    connection.exec_driver_sql(f'DROP TABLE "{table.name}"')
+    connection.exec_driver_sql(f'ALTER TABLE "{temporary.name}" RENAME TO "{table.name}"')
+
+def _alter_table(connection, inspector, table, missing, not_null, defaults, foreign_keys):
+    """
+    Brings a table up to date in place with ALTER TABLE (PostgreSQL and other full DDL databases).
+
+    Args:
+        connection (Connection): Connection to the database.
+        inspector (Inspector): Inspector bound to the database.
+        table (Table): The model's table.
+        missing (list[Column]): Columns to add.
+        not_null (list[Column]): Existing columns to make NOT NULL.
+        defaults (list[Column]): Existing columns to give their server default.
+        foreign_keys (list[ForeignKeyConstraint]): Constraints to recreate with the model's ON DELETE.
+    """
+    dialect = connection.dialect
+    ddl = dialect.ddl_compiler(dialect, None)
+
+    for column in missing:
+        default = f" DEFAULT {ddl.get_column_default_string(column)}" if column.server_default is not None else ""
+        connection.exec_driver_sql(
+            f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column.type.compile(dialect=dialect)}{default}'
+        )
+    for column in defaults:
+        connection.exec_driver_sql(
+            f'ALTER TABLE "{table.name}" ALTER COLUMN "{column.name}" '
+            f'SET DEFAULT {ddl.get_column_default_string(column)}'
+        )
+    for column in missing + not_null:
+        fill = _backfill(table.name, column)
+        if fill:
+            connection.exec_driver_sql(
+                f'UPDATE "{table.name}" SET "{column.name}" = {fill} WHERE "{column.name}" IS NULL'
+            )
+        if not column.nullable:
+            connection.exec_driver_sql(f'ALTER TABLE "{table.name}" ALTER COLUMN "{column.name}" SET NOT NULL')
+
+    reflected = {tuple(fk["constrained_columns"]): fk["name"] for fk in inspector.get_foreign_keys(table.name)}
+    for constraint in foreign_keys:
+        name = reflected.get(tuple(constraint.column_keys))
+        if name:
+            connection.exec_driver_sql(f'ALTER TABLE "{table.name}" DROP CONSTRAINT "{name}"')
+        connection.execute(AddConstraint(constraint))
+
+def upgrade_schema(engine):
+    """
+    Upgrades tables created by older versions of the models to the current definitions.
+
+    `create_all` only creates missing tables, so databases from before the schema changes
+    lack `notes.updated_at` and `notes.content_hash`, the `ON DELETE CASCADE` foreign keys,
+    the NOT NULL and server defaults on `flashcards.type`, `notes.created_at` and
+    `scores.answered`, and the newer indexes. This adds them and fills existing rows
+    according to `BACKFILLS` (`updated_at` from `created_at`, `type` as "text").
+
+    SQLite tables with differences are rebuilt; other databases are altered in place.
+    Column type changes (e.g. to timezone-aware timestamps) are not migrated. The function
+    only inspects the schema when everything is current, so it is safe to run on every start.
+
+    Args:
+        engine (Engine): SQLAlchemy engine of the database to upgrade.
+    """
+    inspector = inspect(engine)
+    tables = [table for table in Base.metadata.sorted_tables if inspector.has_table(table.name)]
+    outdated = [(table, _outdated_parts(inspector, table)) for table in tables]
+    outdated = [(table, parts) for table, parts in outdated if any(parts)]
+
+    if outdated and engine.dialect.name == "sqlite":
+        with engine.connect() as connection:
+            connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+            connection.commit()
+            try:
+                with connection.begin():
+                    for table, _ in outdated:
+                        _rebuild_sqlite_table(connection, table)
+            finally:
+                connection.exec_driver_sql("PRAGMA foreign_keys=ON")
+                connection.commit()
+    elif outdated:
+        with engine.begin() as connection:
+            for table, parts in outdated:
+                _alter_table(connection, inspector, table, *parts)
+
+    with engine.begin() as connection:
+        for table in tables:
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
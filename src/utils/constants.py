@@ -40,6 +40,8 @@ class ErrorMessages:
         NO_SUMMARY_AVAILABLE (str): Error when attempting to summarize a note without a summary.
         MISSING_ANSWER_FIELD (str): Error when the answer field is absent in the request body.
         MISSING_LANGUAGE (str): Error when the language field is missing from the request.
+
+        INTERNAL_ERROR (str): Error returned for unexpected server-side failures; details are only logged.
     """
     USER_NOT_FOUND = "User not found."
     USER_ALREADY_EXISTS = "User already exists."
@@ -66,6 +68,8 @@ class ErrorMessages:
     MISSING_ANSWER_FIELD = "Answer field is missing in the request."
     MISSING_LANGUAGE = "Missing Language"
 
+    INTERNAL_ERROR = "An unexpected error occurred."
+
 class HttpStatus:
     """
    Collection of standard HTTP status codes used throughout the application.
@@ -79,6 +83,7 @@ class HttpStatus:
        OK (int): HTTP 200 — Standard response for successful HTTP requests.
        CREATED (int): HTTP 201 — Indicates that a resource has been successfully created.
        NO_CONTENT (int): HTTP 204 — Successful request that returns no content.
+       NOT_MODIFIED (int): HTTP 304 — The cached representation identified by the request's ETag is still current.
 
        BAD_REQUEST (int): HTTP 400 — The request was invalid or cannot be otherwise served.
        UNAUTHORIZED (int): HTTP 401 — Authentication is required and has failed or has not been provided.
@@ -90,6 +95,7 @@ class HttpStatus:
     OK = 200
     CREATED = 201
     NO_CONTENT = 204
+    NOT_MODIFIED = 304
     BAD_REQUEST = 400
     UNAUTHORIZED = 401
     FORBIDDEN = 403
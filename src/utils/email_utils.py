@@ -1,16 +1,54 @@
+import logging
 import os
 import smtplib
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from email.mime.text import MIMEText
-from dotenv import load_dotenv
-
-load_dotenv()
+from functools import lru_cache
+from threading import Lock
 
 SMTP_SERVER = os.getenv("SMTP_SERVER")
 SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
 SMTP_USERNAME = os.getenv("SMTP_USERNAME")
 SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
 FROM_EMAIL = os.getenv("FROM_EMAIL")
+EMAIL_WORKERS = 1
+
+logger = logging.getLogger(__name__)
+
+_smtp: smtplib.SMTP | None = None
+_smtp_lock = Lock()
+
+
+def _connect_smtp() -> smtplib.SMTP:
+    server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
+    server.starttls()
+    server.login(SMTP_USERNAME, SMTP_PASSWORD)
+    return server
+
+
+def _sendmail(to_email: str, message: str) -> None:
+    """
+    Sends a message over the shared SMTP connection, connecting on first use.
+
+    The connection (with STARTTLS and login already done) is kept open between emails and
+    used by one sender at a time. If the server has dropped it in the meantime, e.g. after
+    its idle timeout, a new connection is opened and the message is sent again once.
+
+    Args:
+        to_email (str): Recipient address.
+        message (str): The complete message including headers.
+    """
+    global _smtp
+    with _smtp_lock:
+        if _smtp is None:
+            _smtp = _connect_smtp()
+        try:
+            _smtp.sendmail(FROM_EMAIL, to_email, message)
+        except smtplib.SMTPServerDisconnected:
+            _smtp = None
+            _smtp = _connect_smtp()
+            _smtp.sendmail(FROM_EMAIL, to_email, message)
 
 
 def send_reset_email(to_email: str, reset_link: str) -> None:
@@ -22,7 +60,35 @@ def send_reset_email(to_email: str, reset_link: str) -> None:
     msg["From"] = FROM_EMAIL
     msg["To"] = to_email
 
-    with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-        server.starttls()
-        server.login(SMTP_USERNAME, SMTP_PASSWORD)
-        server.sendmail(FROM_EMAIL, to_email, msg.as_string())
+    _sendmail(to_email, msg.as_string())
+
+
+@lru_cache(maxsize=None)
+def _email_pool() -> ThreadPoolExecutor:
+    """Returns the thread pool that delivers emails in the background, created on first use."""
+    return ThreadPoolExecutor(max_workers=EMAIL_WORKERS, thread_name_prefix="email")
+
+
+def _log_failure(future: Future) -> None:
+    error = future.exception()
+    if error is not None:
+        logger.error("Sending email failed", exc_info=error)
+
+
+def queue_reset_email(to_email: str, reset_link: str) -> Future:
+    """
+    Sends the password reset email in a background thread and returns immediately.
+
+    Delivery happens off the request path over the shared SMTP connection; delivery
+    errors are logged instead of being raised to the caller.
+
+    Args:
+        to_email (str): Recipient address.
+        reset_link (str): The password reset URL to include.
+
+    Returns:
+        Future: Completes once the email has been handed to the SMTP server.
+    """
+    future = _email_pool().submit(send_reset_email, to_email, reset_link)
+    future.add_done_callback(_log_failure)
+    return future
@@ -0,0 +1,31 @@
+import orjson
+
+from flask.json.provider import DefaultJSONProvider
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that serializes and parses with `orjson` instead of the stdlib `json` module.
+
+    `jsonify`, `request.get_json` and `app.json.*` all route through this provider once it is
+    installed via `app.json = OrjsonProvider(app)`. Formatting arguments such as `indent` or
+    `sort_keys` are ignored; output is always compact. Types orjson cannot encode natively fall
+    back to Flask's default handling (e.g. `Decimal`, `UUID`, dataclasses).
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """
+        Builds a JSON response directly from orjson's `bytes` output, skipping the
+        decode to `str` and re-encode to UTF-8 the default provider goes through.
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
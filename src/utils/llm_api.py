@@ -1,17 +1,68 @@
 import json
 import re
+import string
 
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
 from typing import Tuple
 from openai import OpenAI
 from openai.types.chat import ChatCompletionSystemMessageParam, ChatCompletionUserMessageParam
 
 from src.config.config import Config
 
+ANSWER_CHECK_FAILED = "Could not evaluate answer."
+SUMMARY_NOT_EXTRACTED = "Summary could not be extracted."
+SUMMARY_NOT_GENERATED = "Summary could not be generated."
+
+FLASHCARD_SEPARATOR = re.compile(r"\n{2,}")
+FLASHCARD_LABEL_SUFFIXES = ":-–"
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+OPENAI_TIMEOUT_SECONDS = 30
+
+ANSWER_CACHE_SIZE = 4096
+_answer_cache = OrderedDict()
+_answer_cache_lock = Lock()
+
+@lru_cache(maxsize=None)
 def get_openai_client():
+    """
+    Returns the process-wide OpenAI client, created on first use.
+
+    Sharing one client keeps its HTTP connection pool alive between calls, so only the
+    first request to the API pays for the TCP and TLS handshake. The client is thread-safe.
+    Requests time out after `OPENAI_TIMEOUT_SECONDS` instead of the SDK's ten minutes, so a
+    stalled connection cannot hold a request worker for long.
+
+    Raises:
+        ValueError: If `OPENAI_API_KEY` is not configured.
+    """
     api_key = Config.OPENAI_API_KEY
     if not api_key:
         raise ValueError("OPENAI_API_KEY is not set")
-    return OpenAI(api_key=api_key)
+    return OpenAI(api_key=api_key, timeout=OPENAI_TIMEOUT_SECONDS)
+
+def _parse_json_response(content: str) -> dict:
+    """
+    Parses a JSON object from an LLM response, tolerating text around it.
+
+    Args:
+        content (str): The raw response text.
+
+    Returns:
+        dict: The parsed object, or an empty dict if none could be extracted.
+    """
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        match = re.search(r'\{.*\}', content, re.DOTALL)
+        if match:
+            try:
+                return json.loads(match.group())
+            except json.JSONDecodeError:
+                return {}
+        return {}
 
 def generate_summary_from_note(note_content: str) -> Tuple[str, str]:
     """
@@ -64,30 +115,166 @@ def generate_summary_from_note(note_content: str) -> Tuple[str, str]:
         )
 
         content = response.choices[0].message.content.strip()
-
-        try:
-            return_data = json.loads(content)
-        except json.JSONDecodeError:
-            match = re.search(r'\{.*\}', content, re.DOTALL)
-            if match:
-                try:
-                    return_data = json.loads(match.group())
-                except json.JSONDecodeError:
-                    return_data = {}
-            else:
-                return_data = {}
+        return_data = _parse_json_response(content)
 
         summary = return_data.get("summary", "").strip()
         language = return_data.get("language", "").strip()
 
         if not summary:
-            summary = "Summary could not be extracted."
+            summary = SUMMARY_NOT_EXTRACTED
         return summary, language
 
     except Exception as error:
         print(f"❌ OpenAI API error (summary): {error}")
-        return "Summary could not be generated.", ""
+        return SUMMARY_NOT_GENERATED, ""
+
+
+def generate_summary_and_flashcards(note_content: str) -> Tuple[str, str, list[dict]]:
+    """
+    Summarizes a note, detects its language and creates 3–5 flashcards in a single OpenAI request.
+
+    Combines `generate_summary_from_note` and `generate_flashcards_from_summary` into one
+    prompt, so a new note costs one round-trip and one pass over the note instead of two
+    sequential requests. The flashcards are based on the note itself and written in its language.
+
+    Args:
+        note_content (str): The full text of the note.
+
+    Returns:
+        Tuple[str, str, list[dict]]: A tuple containing:
+            - The generated summary (str), or one of the fallback texts on failure
+            - The detected language of the note (str)
+            - The flashcards as dicts with "question" and "answer" (empty on failure)
+    """
+    client = get_openai_client()
+    try:
+        messages: list[ChatCompletionSystemMessageParam | ChatCompletionUserMessageParam] = [
+            ChatCompletionSystemMessageParam(
+                role="system",
+                content=(
+                    "You are an educational assistant that summarizes notes, identifies the language used "
+                    "and creates clear flashcards to help users learn efficiently. "
+                    "Return only JSON in the required format."
+                )
+            ),
+            ChatCompletionUserMessageParam(
+                role="user",
+                content=(
+                    "You will be given a user-written note. Your job is to:\n"
+                    "1. Read and understand the note exactly as it is.\n"
+                    "2. Detect its original language (e.g. en, de, fr, etc).\n"
+                    "3. Write a **clear and concise summary** of the note that captures all key information.\n"
+                    "4. Create 3–5 educational flashcards in the same language, each with a concise question "
+                    "and a clear, complete answer. The questions must NOT contain the answers.\n"
+                    "5. Return your response in the following **exact JSON** format:\n\n"
+                    "{ \"summary\": \"<summary here>\", \"language\": \"<language code>\", "
+                    "\"flashcards\": [{ \"question\": \"<question>\", \"answer\": \"<answer>\" }] }\n\n"
+                    "⚠️ Important:\n"
+                    "- Do NOT add any explanations before or after the JSON.\n"
+                    "- Do NOT mention originality or quality.\n"
+                    "- Do NOT use markdown inside the flashcards.\n"
+                    "- Only return valid JSON.\n\n"
+                    f"Note:\n{note_content}"
+                )
+            )
+        ]
+
+        response = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=messages,
+            temperature=0.5,
+            max_tokens=600
+        )
+
+        return_data = _parse_json_response(response.choices[0].message.content.strip())
+
+        summary = str(return_data.get("summary", "")).strip()
+        language = str(return_data.get("language", "")).strip()
+        flashcards = [
+            {"question": str(card["question"]).strip(), "answer": str(card["answer"]).strip()}
+            for card in return_data.get("flashcards") or []
+            if isinstance(card, dict) and card.get("question") and card.get("answer")
+        ]
+
+        if not summary:
+            summary = SUMMARY_NOT_EXTRACTED
+        return summary, language, flashcards
+
+    except Exception as error:
+        print(f"❌ OpenAI API error (summary and flashcards): {error}")
+        return SUMMARY_NOT_GENERATED, "", []
+
+
+def _find_label(lowered: str, label: str, start: int = 0) -> Tuple[int, int] | None:
+    """
+    Finds `label` followed by one of `FLASHCARD_LABEL_SUFFIXES` in lowercased text.
+
+    Args:
+        lowered (str): The text, lowercased.
+        label (str): The lowercase label to look for, e.g. "question".
+        start (int): Index to start searching from.
+
+    Returns:
+        Tuple[int, int] | None: The start of the label and the index right after its suffix,
+        or None if the label does not occur.
+    """
+    index = lowered.find(label, start)
+    while index != -1:
+        end = index + len(label)
+        if end < len(lowered) and lowered[end] in FLASHCARD_LABEL_SUFFIXES:
+            return index, end + 1
+        index = lowered.find(label, end)
+    return None
+
+def _split_complete_flashcards(buffer: str, final: bool = False) -> Tuple[list[dict], str]:
+    """
+    Extracts the complete flashcards from a (partial) LLM response.
+
+    A flashcard starts at a "Question:" label, its question runs up to the next "Answer:"
+    label (blank lines in between are allowed), and its answer ends at the next blank line,
+    or at the end of the response once it is `final`. The labels are located with plain
+    substring searches on an ASCII-lowercased copy (which keeps the indices of the
+    original), so the buffer is scanned once without regex backtracking.
+
+    Text before the first question label (e.g. an introductory sentence) is dropped; only
+    a started flashcard, or a tail that may be the beginning of a label, is kept as rest.
 
+    Args:
+        buffer (str): The response text received so far.
+        final (bool): Whether the response is complete, so the last answer may end without a blank line.
+
+    Returns:
+        Tuple[list[dict], str]: The complete flashcards and the unconsumed rest of the buffer.
+    """
+    lowered = buffer.translate(_ASCII_LOWER)
+    flashcards = []
+    position = 0
+    while True:
+        question = _find_label(lowered, "question", position)
+        if question is None:
+            if final:
+                return flashcards, ""
+            return flashcards, buffer[max(position, len(buffer) - len("question")):]
+
+        answer = _find_label(lowered, "answer", question[1])
+        if answer is None:
+            return flashcards, "" if final else buffer[question[0]:]
+
+        answer_start = answer[1]
+        while answer_start < len(buffer) and buffer[answer_start].isspace():
+            answer_start += 1
+        separator = FLASHCARD_SEPARATOR.search(buffer, answer_start)
+        if separator is not None:
+            answer_end, position = separator.start(), separator.end()
+        elif final:
+            answer_end = position = len(buffer)
+        else:
+            return flashcards, buffer[question[0]:]
+
+        flashcards.append({
+            "question": buffer[question[1]:answer[0]].strip(),
+            "answer": buffer[answer_start:answer_end].strip()
+        })
 
 def generate_flashcards_from_summary(ai_summary: str, language: str) -> list[dict]:
     """
@@ -96,12 +283,17 @@ def generate_flashcards_from_summary(ai_summary: str, language: str) -> list[dic
     The assistant identifies structured content (e.g. lists, tables) to formulate meaningful flashcard questions
     and answers. Questions are designed to not contain the answers directly. All output is returned in the specified language.
 
+    The completion is streamed and each flashcard is parsed as soon as it has been fully received;
+    the cards are returned together once the completion has ended. A completion that did not
+    finish cleanly (cut off at the token limit, filtered or interrupted) yields no cards, so
+    callers never replace existing flashcards with a partial set.
+
     Args:
         ai_summary (str): The summary content to base flashcards on.
         language (str): The language in which the flashcards should be written.
 
     Returns:
-        list[dict]: A list of flashcard dictionaries, each containing:
+        list[dict]: The flashcards (empty if the request failed or was incomplete), each containing:
             - "question" (str): The flashcard question.
             - "answer" (str): The flashcard answer.
     """
@@ -130,26 +322,31 @@ def generate_flashcards_from_summary(ai_summary: str, language: str) -> list[dic
             )
         ]
 
-        response = client.chat.completions.create(
+        stream = client.chat.completions.create(
             model="gpt-4o-mini",
             messages=messages,
             temperature=0.7,
-            max_tokens=300
+            max_tokens=600,
+            stream=True
         )
 
-        content = response.choices[0].message.content.strip()
-
         flashcards = []
-        pattern = r"(?i)question[:\-–]\s*(.*?)\s*answer[:\-–]\s*(.*?)(?=\n{2,}|$)"
-        matches = re.findall(pattern, content, re.DOTALL)
-
-        for question, answer in matches:
-            flashcards.append({
-                "question": question.strip(),
-                "answer": answer.strip()
-            })
-
-        return flashcards
+        buffer = ""
+        finish_reason = None
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            buffer += chunk.choices[0].delta.content or ""
+            finish_reason = chunk.choices[0].finish_reason or finish_reason
+            complete, buffer = _split_complete_flashcards(buffer)
+            flashcards.extend(complete)
+
+        if finish_reason != "stop":
+            print(f"❌ Incomplete flashcard completion (finish reason: {finish_reason})")
+            return []
+
+        complete, _ = _split_complete_flashcards(buffer, final=True)
+        return flashcards + complete
 
     except Exception as error:
         print(f"❌ OpenAI API error (flashcards): {error}")
@@ -212,4 +409,43 @@ def check_user_answer_with_llm(question: str, correct_answer: str, user_answer:
 
     except Exception as error:
         print(f"OpenAI API error (answer check): {error}")
-        return {"evaluation": "Could not evaluate answer."}
+        return {"evaluation": ANSWER_CHECK_FAILED}
+
+def check_user_answer_cached(question: str, correct_answer: str, user_answer: str, language: str) -> dict:
+    """
+    Evaluates an answer with the LLM, reusing the result of an identical earlier evaluation.
+
+    Results are kept in a process-wide LRU of `ANSWER_CACHE_SIZE` entries shared by the
+    check-answer route and quiz submissions. Runs of whitespace in the user's answer are
+    collapsed so resubmissions that differ only in spacing hit the cache; matching is exact
+    otherwise, since case (e.g. chemical symbols or acronyms) and similar-looking answers
+    ("X" vs. "not X") can change the grade.
+    Failed evaluations are not cached.
+
+    Args:
+        question (str): The original flashcard question.
+        correct_answer (str): The expected correct answer.
+        user_answer (str): The user's submitted answer.
+        language (str): The language of the content for evaluation.
+
+    Returns:
+        dict: The evaluation result from `check_user_answer_with_llm`.
+    """
+    normalized_answer = " ".join(user_answer.split())
+    key = (question, correct_answer, normalized_answer, language)
+
+    with _answer_cache_lock:
+        if key in _answer_cache:
+            _answer_cache.move_to_end(key)
+            return _answer_cache[key]
+
+    result = check_user_answer_with_llm(question, correct_answer, user_answer, language)
+    if result.get("evaluation") == ANSWER_CHECK_FAILED:
+        return result
+
+    with _answer_cache_lock:
+        _answer_cache[key] = result
+        if len(_answer_cache) > ANSWER_CACHE_SIZE:
+            _answer_cache.popitem(last=False)
+
+    return result
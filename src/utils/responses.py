@@ -0,0 +1,125 @@
+from typing import Iterable
+
+import msgpack
+import orjson
+
+from flask import Response, jsonify, request, stream_with_context
+
+from src.utils.constants import HttpStatus
+
+MSGPACK_MIMETYPE = "application/msgpack"
+JSON_MIMETYPE = "application/json"
+NDJSON_MIMETYPE = "application/x-ndjson"
+STREAM_MIMETYPES = (JSON_MIMETYPE, MSGPACK_MIMETYPE, NDJSON_MIMETYPE)
+
+
+def negotiate_mimetype(offered: Iterable[str] = (JSON_MIMETYPE, MSGPACK_MIMETYPE)) -> str:
+    """
+    Picks the response format for the request's `Accept` header.
+
+    Args:
+        offered (Iterable[str]): The mimetypes the endpoint can produce, preferred first.
+
+    Returns:
+        str: The best match, or JSON if the client accepts none of them.
+    """
+    return request.accept_mimetypes.best_match(list(offered)) or JSON_MIMETYPE
+
+
+def respond(data, status: int) -> tuple[Response, int]:
+    """
+    Serializes a payload as JSON or MessagePack, depending on the request's `Accept` header.
+
+    JSON stays the default (also for `*/*`); MessagePack is only returned when the client
+    prefers `application/msgpack`. Intended for list endpoints whose payload grows with the
+    number of rows.
+
+    Args:
+        data: A JSON-serializable payload (dicts, lists, strings, numbers, booleans, None).
+        status (int): The HTTP status code to return.
+
+    Returns:
+        tuple[Response, int]: The response and the status code, as returned by route handlers.
+    """
+    if negotiate_mimetype() == MSGPACK_MIMETYPE:
+        response = Response(msgpack.packb(data), mimetype=MSGPACK_MIMETYPE)
+    else:
+        response = jsonify(data)
+
+    response.vary.add("Accept")
+    return response, status
+
+
+def respond_stream(rows: Iterable[dict], status: int, envelope: str | None = None) -> tuple[Response, int]:
+    """
+    Streams rows as JSON Lines when the client asks for `application/x-ndjson`, otherwise
+    falls back to `respond` with the rows collected into a list (wrapped as `{envelope: [...]}`
+    if an envelope key is given).
+
+    The stream keeps the request context (and with it the request's database session) alive
+    until the last row is written, so `rows` may lazily pull from an open cursor.
+
+    Args:
+        rows (Iterable[dict]): JSON-serializable rows, typically a generator over a query result.
+        status (int): The HTTP status code to return.
+        envelope (str, optional): Key to nest the collected list under in non-streamed responses.
+
+    Returns:
+        tuple[Response, int]: The response and the status code, as returned by route handlers.
+    """
+    if negotiate_mimetype(STREAM_MIMETYPES) != NDJSON_MIMETYPE:
+        return respond({envelope: list(rows)} if envelope else list(rows), status)
+
+    def generate():
+        for row in rows:
+            yield orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE)
+
+    response = Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+    response.vary.add("Accept")
+    return response, status
+
+
+def etag_matches(etag: str) -> bool:
+    """
+    Checks whether the request's `If-None-Match` header matches the given weak ETag.
+
+    Args:
+        etag (str): The current ETag value of the resource (unquoted).
+
+    Returns:
+        bool: True if the client's cached copy is still current.
+    """
+    return request.if_none_match.contains_weak(etag)
+
+
+def tag_response(response: Response, etag: str) -> Response:
+    """
+    Sets a weak ETag on a response and asks private caches to revalidate before reuse.
+
+    Args:
+        response (Response): The response to tag.
+        etag (str): The current ETag value of the resource (unquoted).
+
+    Returns:
+        Response: The same response, for chaining.
+    """
+    response.set_etag(etag, weak=True)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+def not_modified(etag: str, vary: Iterable[str] = ()) -> Response:
+    """
+    Builds an empty 304 Not Modified response carrying the resource's ETag.
+
+    Args:
+        etag (str): The current ETag value of the resource (unquoted).
+        vary (Iterable[str]): Request headers the 200 response varies on; a 304 must repeat them.
+
+    Returns:
+        Response: The 304 response.
+    """
+    response = tag_response(Response(status=HttpStatus.NOT_MODIFIED), etag)
+    response.vary.update(vary)
+    return response
@@ -1,8 +1,15 @@
 import pytest
 
+from contextlib import contextmanager
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+
+load_dotenv(override=False)
+
 from src.app import create_app
 from src.config.config import DevelopmentConfig
-from src.data.db import Base, get_engine, get_session_local
+from src.data.db import Base, get_engine, get_session_local, get_scoped_session
 from src.data.models import Note
 from src.data.models.users import User
 
@@ -40,7 +47,7 @@ def test_app(test_engine):
     """
     app = create_app(TestConfig)
     app.config['ENGINE'] = test_engine
-    app.config['SESSION_LOCAL'] = get_session_local(test_engine)
+    app.config['SESSION_LOCAL'] = get_scoped_session(test_engine, raise_on_lazy_load=TestConfig.DB_RAISE_ON_LAZY_LOAD)
 
     ctx = app.app_context()
     ctx.push()
@@ -174,3 +181,36 @@ def create_note(session, create_user):
     yield note
     session.delete(note)
     session.commit()
+
+@contextmanager
+def count_queries(session):
+    """
+    Records every SQL statement sent to the database through the session's engine while the block runs.
+
+    Meant for pinning the number of round-trips of a service call, so an accidental lazy load
+    or per-row query shows up as a failing bound instead of silently multiplying DB traffic:
+
+        with count_queries(session) as queries:
+            service.get_progress(user_id, note_id)
+        assert len(queries) == 1
+
+    The listener is attached to the engine, so statements issued by other sessions on the
+    same engine during the block are counted as well.
+
+    Args:
+        session (Session): The session whose bound engine to observe.
+
+    Yields:
+        list[str]: The executed statements, appended as they are sent.
+    """
+    engine = session.get_bind()
+    statements = []
+
+    def record(_conn, _cursor, statement, _parameters, _context, _executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
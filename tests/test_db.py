@@ -1,8 +1,11 @@
 import os
 import pytest
 
-from src.data.models import User, Note
-from src.data.db import get_engine, get_session_local, Base, init_db
+from sqlalchemy import inspect, update
+from sqlalchemy.exc import InvalidRequestError
+
+from src.data.models import User, Note, Flashcard
+from src.data.db import get_engine, get_session_local, get_scoped_session, Base, init_db
 
 TEST_DATABASE_URL = "sqlite:///./testdb.sqlite"
 
@@ -86,4 +89,102 @@ def test_user_and_note_create(session):
     assert user.id is not None or user.user_id is not None
     assert note.note_id is not None
     assert note.user_id == user.id
-    assert note.original == "Some content"
\ No newline at end of file
+    assert note.original == "Some content"
+
+
+def test_lazy_load_raises(engine, setup_database):
+    """
+    Tests that a scoped session created with `raise_on_lazy_load` rejects lazy loads that emit SQL.
+
+    Args:
+        engine (Engine): The SQLAlchemy engine connected to the test database.
+        setup_database: Ensures the schema exists.
+    """
+
+    registry = get_scoped_session(engine, raise_on_lazy_load=True)
+    user = User(username="lazy", email="lazy@example.com")
+    user.set_password("password123")
+    registry.add(user)
+    registry.commit()
+    user_id = user.id
+
+    registry.expunge_all()
+    loaded = registry.get(User, user_id)
+    with pytest.raises(InvalidRequestError):
+        _ = loaded.notes
+
+    registry.delete(loaded)
+    registry.commit()
+    registry.remove()
+
+
+def test_lazy_load_guard_allows_orm_dml(engine, setup_database):
+    """
+    Tests that the lazy-load guard leaves ORM-enabled UPDATE statements alone.
+
+    Args:
+        engine (Engine): The SQLAlchemy engine connected to the test database.
+        setup_database: Ensures the schema exists.
+    """
+
+    registry = get_scoped_session(engine, raise_on_lazy_load=True)
+    user = User(username="guarded", email="guarded@example.com")
+    user.set_password("password123")
+    registry.add(user)
+    registry.commit()
+
+    registry.execute(update(User).where(User.id == user.id).values(email="renamed@example.com"))
+    registry.commit()
+    assert registry.get(User, user.id).email == "renamed@example.com"
+
+    registry.delete(user)
+    registry.commit()
+    registry.remove()
+
+
+LEGACY_SCHEMA = (
+    "CREATE TABLE users (id INTEGER NOT NULL PRIMARY KEY, username VARCHAR NOT NULL UNIQUE, "
+    "email VARCHAR NOT NULL UNIQUE, password_hash VARCHAR NOT NULL, is_admin BOOLEAN, created_at DATETIME)",
+    "CREATE TABLE notes (note_id INTEGER NOT NULL PRIMARY KEY, title VARCHAR, original TEXT NOT NULL, "
+    "ai_summary TEXT, created_at DATETIME NOT NULL, language VARCHAR, "
+    "user_id INTEGER NOT NULL REFERENCES users (id))",
+    "CREATE TABLE flashcards (card_id INTEGER NOT NULL PRIMARY KEY, question TEXT NOT NULL, "
+    "answer TEXT NOT NULL, type VARCHAR(50), note_id INTEGER REFERENCES notes (note_id), "
+    "learned BOOLEAN, last_studied DATETIME, times_reviewed INTEGER)",
+    "INSERT INTO users (id, username, email, password_hash) VALUES (1, 'legacy', 'legacy@example.com', 'x')",
+    "INSERT INTO notes (note_id, original, created_at, user_id) VALUES (1, 'Old note', '2024-01-01 00:00:00', 1)",
+    "INSERT INTO flashcards (card_id, question, answer, note_id) VALUES (1, 'Q?', 'A.', 1)",
+)
+
+def test_init_db_upgrades_legacy_schema(tmp_path):
+    """
+    Tests that `init_db` brings a database created by the old models up to date.
+
+    Builds the pre-upgrade `users`, `notes` and `flashcards` tables with one row each and
+    asserts that the new columns are added and backfilled, `type` is filled with "text"
+    and deleting the user now cascades to its notes and flashcards.
+
+    Args:
+        tmp_path (Path): Pytest fixture providing a temporary directory for the database file.
+    """
+
+    legacy_engine = get_engine(f"sqlite:///{tmp_path / 'legacy.sqlite'}")
+    with legacy_engine.begin() as connection:
+        for statement in LEGACY_SCHEMA:
+            connection.exec_driver_sql(statement)
+
+    init_db(legacy_engine)
+
+    assert {"updated_at", "content_hash"} <= {column["name"] for column in inspect(legacy_engine).get_columns("notes")}
+    legacy_session = get_session_local(legacy_engine)()
+    note = legacy_session.get(Note, 1)
+    assert note.updated_at == note.created_at.replace(tzinfo=None)
+    assert legacy_session.get(Flashcard, 1).type == "text"
+
+    legacy_session.delete(legacy_session.get(User, 1))
+    legacy_session.commit()
+    assert legacy_session.query(Note).count() == 0
+    assert legacy_session.query(Flashcard).count() == 0
+
+    legacy_session.close()
+    legacy_engine.dispose()
@@ -4,6 +4,7 @@ import pytest
 import time
 
 from src.app import create_app
+from src.utils.constants import ErrorMessages
 from conftest import TestConfig
 
 @pytest.fixture
@@ -67,6 +68,26 @@ def test_ping_route(client):
     assert response.status_code == 200
     assert response.data == b"pong"
 
+def test_unexpected_error_is_generic(app, caplog):
+    """
+    Verify that unhandled errors return a generic 500 response and are logged.
+
+    Registers a route that raises an exception carrying internal details and checks
+    that the details appear in the log but not in the JSON response.
+
+    Args:
+        app (flask.Flask): The Flask application instance from the fixture.
+        caplog (pytest.LogCaptureFixture): Pytest fixture capturing log records.
+    """
+    @app.route("/raise-error")
+    def raise_error():
+        raise RuntimeError("internal detail")
+
+    response = app.test_client().get("/raise-error")
+    assert response.status_code == 500
+    assert response.get_json() == {"error": ErrorMessages.INTERNAL_ERROR}
+    assert "internal detail" in caplog.text
+
 def test_create_app_raises(monkeypatch, test_log_file):
     """
     Simulate an exception during Flask app initialization.
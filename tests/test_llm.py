@@ -1,11 +1,14 @@
 import pytest
 
+from types import SimpleNamespace
+
 from src.data.models import Flashcard
 from src.data.models.notes import Note
+from src.app.services.flashcard_service import FlashcardService
 from src.app.services.llm_service import LLMService
 from src.utils.constants import ErrorMessages
 from src.data.models.users import User
-from src.utils.llm_api import check_user_answer_with_llm
+from src.utils.llm_api import _split_complete_flashcards, check_user_answer_with_llm, generate_flashcards_from_summary
 
 
 @pytest.fixture(autouse=True)
@@ -80,6 +83,40 @@ def test_generate_flashcards(login_auth_client, create_note, session):
     flashcards = session.query(Flashcard).filter_by(note_id=create_note.note_id).all()
     assert len(flashcards) >= 1
 
+def test_generate_summary_and_flashcards(login_auth_client, create_note, session, monkeypatch):
+    """
+    Tests the `/llm/generate-summary-and-flashcards/<note_id>` endpoint.
+
+    Replaces the combined LLM call with a stub and asserts that one request stores both the
+    summary and the flashcards of the note.
+
+    Args:
+        login_auth_client (FlaskClient): Authenticated client with user session.
+        create_note (Note): The note to process.
+        session (Session): SQLAlchemy session used to inspect the stored data.
+        monkeypatch (pytest.MonkeyPatch): Pytest fixture to patch the LLM call.
+    """
+    calls = []
+
+    def fake_generate(note_content):
+        calls.append(note_content)
+        return "AI simulates human intelligence.", "en", [
+            {"question": "What does AI simulate?", "answer": "Human intelligence"},
+            {"question": "Name an AI application.", "answer": "Robotics"},
+        ]
+
+    monkeypatch.setattr("src.app.routes.llm.generate_summary_and_flashcards", fake_generate)
+
+    response = login_auth_client.post(f"/llm/generate-summary-and-flashcards/{create_note.note_id}")
+    assert response.status_code == 201
+    assert response.get_json() == {"ai_summary": "AI simulates human intelligence.", "flashcard_count": 2}
+    assert len(calls) == 1
+
+    session.refresh(create_note)
+    assert create_note.ai_summary == "AI simulates human intelligence."
+    flashcards = session.query(Flashcard).filter_by(note_id=create_note.note_id).all()
+    assert {card.question for card in flashcards} == {"What does AI simulate?", "Name an AI application."}
+
 def test_check_answer(login_auth_client):
     """
     Tests the `/llm/check-answer` endpoint which uses an LLM to evaluate a user's answer.
@@ -105,6 +142,46 @@ def test_check_answer(login_auth_client):
     print("User answer:", user_answer)
     print("Feedback:", feedback["evaluation"])
 
+def test_check_answer_cache(login_auth_client, monkeypatch):
+    """
+    Tests that `/llm/check-answer` reuses the evaluation for a repeated submission.
+
+    Replaces the LLM call with a counting stub and submits the same answer twice, the second
+    time with different whitespace, then once with different casing. Asserts the LLM is
+    called once for the whitespace variant and again for the casing variant.
+
+    Args:
+        login_auth_client (FlaskClient): Authenticated client with user session.
+        monkeypatch (pytest.MonkeyPatch): Pytest fixture to patch the LLM call.
+    """
+    calls = []
+
+    def fake_check(question, correct_answer, user_answer, language):
+        calls.append(user_answer)
+        return {"evaluation": "Correct."}
+
+    monkeypatch.setattr("src.utils.llm_api.check_user_answer_with_llm", fake_check)
+
+    payload = {
+        "question": "What does ML stand for? (cache test)",
+        "correct_answer": "Machine Learning",
+        "user_answer": "Machine Learning",
+        "language": "en"
+    }
+    response = login_auth_client.post("/llm/check-answer", json=payload)
+    assert response.status_code == 200
+
+    payload["user_answer"] = "  Machine   Learning "
+    response = login_auth_client.post("/llm/check-answer", json=payload)
+    assert response.status_code == 200
+    assert response.get_json() == {"evaluation": "Correct."}
+    assert len(calls) == 1
+
+    payload["user_answer"] = "machine learning"
+    response = login_auth_client.post("/llm/check-answer", json=payload)
+    assert response.status_code == 200
+    assert len(calls) == 2
+
 def test_llm_service_error_handling(session, create_user):
     """
     Tests error handling in the LLMService methods.
@@ -155,4 +232,107 @@ def test_llm_service_error_handling(session, create_user):
             language="en",
             check_user_answer_with_llm=lambda q, c, u, l: {}
         )
-    assert "Missing required fields" in str(exc5.value)
\ No newline at end of file
+    assert "Missing required fields" in str(exc5.value)
+
+
+def _parse_streamed(response: str, chunk_size: int) -> list[dict]:
+    """Feeds `response` to the flashcard parser in chunks of `chunk_size` characters, like a stream."""
+    flashcards = []
+    buffer = ""
+    for start in range(0, len(response), chunk_size):
+        buffer += response[start:start + chunk_size]
+        complete, buffer = _split_complete_flashcards(buffer)
+        flashcards.extend(complete)
+    complete, _ = _split_complete_flashcards(buffer, final=True)
+    return flashcards + complete
+
+@pytest.mark.parametrize("response, expected", [
+    (
+        "Question: What is AI?\nAnswer: Artificial intelligence.\n\nQuestion: What is ML?\nAnswer: Machine learning.",
+        [("What is AI?", "Artificial intelligence."), ("What is ML?", "Machine learning.")],
+    ),
+    (
+        "Question: What is AI?\n\nAnswer: Artificial intelligence.\n\nQuestion: What is ML?\n\nAnswer: Machine learning.",
+        [("What is AI?", "Artificial intelligence."), ("What is ML?", "Machine learning.")],
+    ),
+    (
+        "Here are your flashcards:\n\nQUESTION- Define NLP\nanswer– Natural language processing\n\n\n",
+        [("Define NLP", "Natural language processing")],
+    ),
+    (
+        "Question: Is this a question-answer pair?\nAnswer:\n\nYes.",
+        [("Is this a question-answer pair?", "Yes.")],
+    ),
+    ("No flashcards here.", []),
+])
+def test_split_complete_flashcards(response, expected):
+    """
+    Tests the streaming flashcard parser on complete responses and on every chunking of them.
+
+    Feeding the response in chunks of every size from one character up puts chunk boundaries
+    inside the labels and the blank-line separators; the result must not depend on them.
+
+    Args:
+        response (str): A raw LLM response.
+        expected (list[tuple[str, str]]): The expected (question, answer) pairs.
+    """
+    expected_cards = [{"question": question, "answer": answer} for question, answer in expected]
+    for chunk_size in range(1, len(response) + 1):
+        assert _parse_streamed(response, chunk_size) == expected_cards
+
+def test_generate_flashcards_replaces_cards_after_generation(session, create_note):
+    """
+    Tests that `LLMService.generate_flashcards` keeps the existing flashcards until generation finishes.
+
+    The stub generator checks that the old card is still stored while it runs. Afterwards the
+    old card must be replaced by the generated ones, and a run without cards must keep them.
+
+    Args:
+        session (Session): SQLAlchemy session for database access.
+        create_note (Note): The note to generate flashcards for.
+    """
+    create_note.ai_summary = "AI is the field of creating intelligent agents."
+    session.add(Flashcard(question="Old?", answer="Old.", note_id=create_note.note_id))
+    session.commit()
+    note_id = create_note.note_id
+
+    def fake_generate(summary, language):
+        assert session.query(Flashcard).filter_by(note_id=note_id, question="Old?").count() == 1
+        return [{"question": question, "answer": "See summary."} for question in ("What is AI?", "What is an agent?")]
+
+    service = LLMService(session)
+    service.generate_flashcards(note_id, create_note.user_id, fake_generate, FlashcardService(session))
+    cards = session.query(Flashcard).filter_by(note_id=note_id).all()
+    assert {card.question for card in cards} == {"What is AI?", "What is an agent?"}
+    assert {card.type for card in cards} == {"text"}
+
+    service.generate_flashcards(note_id, create_note.user_id, lambda summary, language: [],
+                                FlashcardService(session))
+    assert session.query(Flashcard).filter_by(note_id=note_id).count() == 2
+
+
+def _fake_stream_client(text: str, finish_reason: str | None):
+    """Builds a stand-in OpenAI client whose chat completion streams `text` in two chunks."""
+    middle = len(text) // 2
+    chunks = [
+        SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text[:middle]), finish_reason=None)]),
+        SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text[middle:]),
+                                                 finish_reason=finish_reason)]),
+    ]
+    completions = SimpleNamespace(create=lambda **kwargs: iter(chunks))
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+@pytest.mark.parametrize("finish_reason, expected_count", [("stop", 2), ("length", 0), (None, 0)])
+def test_generate_flashcards_discards_incomplete_completion(monkeypatch, finish_reason, expected_count):
+    """
+    Tests that `generate_flashcards_from_summary` returns no cards unless the completion finished cleanly.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): Pytest fixture to replace the OpenAI client.
+        finish_reason (str | None): The finish reason reported in the last streamed chunk.
+        expected_count (int): The expected number of returned flashcards.
+    """
+    text = "Question: What is AI?\nAnswer: Artificial intelligence.\n\nQuestion: What is ML?\nAnswer: Machine learning."
+    monkeypatch.setattr("src.utils.llm_api.get_openai_client", lambda: _fake_stream_client(text, finish_reason))
+
+    assert len(generate_flashcards_from_summary("A summary.", "en")) == expected_count
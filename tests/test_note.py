@@ -189,3 +189,62 @@ def test_note_validation(login_auth_client):
     assert response.status_code == 400
     assert "content" in response.get_json().get("error", "").lower()
 
+
+def test_get_note_not_modified(login_auth_client, session, create_user):
+    """
+    Tests conditional retrieval of a note via its ETag.
+
+    Fetches a note, replays its ETag in `If-None-Match` and expects an empty 304.
+    After the note is updated, the same ETag must no longer match.
+
+    Args:
+        login_auth_client (FlaskClient): Authenticated client.
+        session (Session): SQLAlchemy session.
+        create_user (User): Owner of the note being retrieved.
+    """
+
+    note = Note(title="Cached", original="Content", user_id=create_user.id)
+    session.add(note)
+    session.commit()
+
+    response = login_auth_client.get(f'/note/get-note/{note.note_id}')
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/')
+
+    cached = login_auth_client.get(f'/note/get-note/{note.note_id}', headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.data == b""
+
+    login_auth_client.put(f'/note/update-note/{note.note_id}', json={"title": "Changed"})
+    refreshed = login_auth_client.get(f'/note/get-note/{note.note_id}', headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+
+
+def test_get_notes_etag_per_format(login_auth_client, session, create_user):
+    """
+    Tests that the note list's ETag depends on the negotiated format.
+
+    A JSON ETag replayed with `Accept: application/msgpack` must not produce a 304, and a
+    matching revalidation must repeat `Vary: Accept`.
+
+    Args:
+        login_auth_client (FlaskClient): Authenticated client.
+        session (Session): SQLAlchemy session.
+        create_user (User): Owner of the listed notes.
+    """
+
+    session.add(Note(title="Listed", original="Content", user_id=create_user.id))
+    session.commit()
+
+    response = login_auth_client.get('/note/get-notes', headers={"Accept": "application/json"})
+    etag = response.headers["ETag"]
+
+    cached = login_auth_client.get('/note/get-notes', headers={"Accept": "application/json", "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert "Accept" in cached.headers["Vary"]
+
+    other_format = login_auth_client.get('/note/get-notes',
+                                         headers={"Accept": "application/msgpack", "If-None-Match": etag})
+    assert other_format.status_code == 200
+    assert other_format.mimetype == "application/msgpack"
+    assert other_format.headers["ETag"] != etag
@@ -1,6 +1,11 @@
+import json
+
 import pytest
 
+from conftest import count_queries
+from src.app.services.quiz_service import QuizService
 from src.data.models.flashcards import Flashcard
+from src.data.models.quizzes import Quiz
 
 
 @pytest.fixture()
@@ -49,6 +54,25 @@ def test_start_quiz_success(login_auth_client, create_note, create_flashcards):
     assert all("question" in fc and "card_id" in fc for fc in data["flashcards"])
 
 
+def test_start_quiz_ndjson(login_auth_client, create_note, create_flashcards):
+    """
+    Tests that /quiz/start/<note_id> streams one flashcard per line for `application/x-ndjson`.
+
+    Args:
+        login_auth_client: Authenticated Flask test client.
+        create_note: A test note associated with the user.
+        create_flashcards: Flashcards tied to the note.
+    """
+    response = login_auth_client.post(
+        f"/quiz/start/{create_note.note_id}", headers={"Accept": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    lines = response.get_data(as_text=True).splitlines()
+    assert len(lines) == 3
+    assert all(set(json.loads(line)) == {"card_id", "question", "type"} for line in lines)
+
+
 def test_start_quiz_not_found(login_auth_client):
     """
     Tests the /quiz/start/<note_id> endpoint with an invalid note ID.
@@ -62,3 +86,37 @@ def test_start_quiz_not_found(login_auth_client):
     response = login_auth_client.post("/quiz/start/9999")
     assert response.status_code == 404
     assert "error" in response.get_json()
+
+
+def test_quiz_service_query_counts(session, create_note, create_flashcards, monkeypatch):
+    """
+    Pins the number of SQL statements issued by the quiz service calls.
+
+    `get_progress` must stay a single aggregate and `submit_answer` a single lookup plus
+    the feedback UPDATE, so a lazy load or per-card query sneaking in fails here.
+
+    Args:
+        session: The test database session.
+        create_note: A test note associated with the user.
+        create_flashcards: Flashcards tied to the note.
+        monkeypatch (pytest.MonkeyPatch): Pytest fixture to patch the LLM call.
+    """
+    monkeypatch.setattr(
+        "src.utils.llm_api.check_user_answer_with_llm",
+        lambda question, correct_answer, user_answer, language: {"evaluation": "Correct."}
+    )
+    user_id, note_id = create_note.user_id, create_note.note_id
+    card_id = create_flashcards[0].card_id
+    quiz = Quiz(answer="", card_id=card_id, user_id=user_id)
+    session.add(quiz)
+    session.commit()
+    quiz_id = quiz.quiz_id
+    service = QuizService(session)
+
+    with count_queries(session) as queries:
+        service.get_progress(user_id, note_id)
+    assert len(queries) == 1
+
+    with count_queries(session) as queries:
+        service.submit_answer(user_id, quiz_id, card_id, "Artificial Intelligence (query count)")
+    assert len(queries) == 2
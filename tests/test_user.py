@@ -1,6 +1,6 @@
 import json
 
-from flask import current_app
+from flask import current_app, g
 
 from src.utils.constants import ErrorMessages
 from src.data.models.users import User
@@ -90,3 +90,27 @@ def test_get_user(login_auth_client):
     data = response.get_json()
     assert data["username"] == "testuser"
     assert data["email"] == "testuser@example.com"
+
+
+def test_session_revoked_after_password_change(login_auth_client, session):
+    """
+    Tests that a login session stops authenticating once the account's password changes.
+
+    The password is changed directly in the database, as another session or a reset would,
+    after which the previously logged-in client must be treated as anonymous.
+
+    Args:
+        login_auth_client (FlaskClient): An authenticated Flask test client.
+        session (Session): The test database session.
+    """
+    user = session.query(User).filter_by(username="testuser").first()
+    response = login_auth_client.get(f"/user/get-user/{user.id}")
+    assert response.status_code == 200
+
+    user.set_password("anotherpassword456")
+    session.commit()
+
+    # The module-wide app context keeps Flask-Login's cached user in `g` across requests.
+    g.pop("_login_user", None)
+    response = login_auth_client.get(f"/user/get-user/{user.id}")
+    assert response.status_code == 401